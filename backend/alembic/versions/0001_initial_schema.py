@@ -0,0 +1,72 @@
+"""Initial schema: resumes, job descriptions and tailored resumes
+
+Revision ID: 0001
+Revises:
+Create Date: 2024-01-15 00:00:00
+
+Databases created before migrations existed (via Base.metadata.create_all) already
+have these tables, so each one is only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("resumes"):
+        op.create_table(
+            "resumes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("original_content", sa.Text(), nullable=False),
+            sa.Column("parsed_content", sa.Text(), nullable=False),
+            sa.Column("file_path", sa.String(), nullable=False),
+            sa.Column("file_type", sa.String(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_resumes_id", "resumes", ["id"])
+
+    if not _has_table("job_descriptions"):
+        op.create_table(
+            "job_descriptions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("company", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("extracted_keywords", sa.Text(), nullable=True),
+            sa.Column("requirements", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_job_descriptions_id", "job_descriptions", ["id"])
+
+    if not _has_table("tailored_resumes"):
+        op.create_table(
+            "tailored_resumes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("job_description_id", sa.Integer(), nullable=False),
+            sa.Column("tailored_content", sa.Text(), nullable=False),
+            sa.Column("pdf_path", sa.String(), nullable=True),
+            sa.Column("is_one_page", sa.Boolean(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+        op.create_index("ix_tailored_resumes_id", "tailored_resumes", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("tailored_resumes")
+    op.drop_table("job_descriptions")
+    op.drop_table("resumes")
@@ -0,0 +1,113 @@
+"""Upload dedup, PDF artifacts, tailoring jobs, skill index and created_at indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2024-06-01 00:00:00
+
+Like 0001, every object is only created when missing, so databases that picked up
+some of these tables through create_all upgrade cleanly.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _has_table(name: str) -> bool:
+    return _inspector().has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return column in {c["name"] for c in _inspector().get_columns(table)}
+
+
+def _create_index(name: str, table: str, columns: list, unique: bool = False) -> None:
+    if name not in {index["name"] for index in _inspector().get_indexes(table)}:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    if not _has_column("resumes", "content_hash"):
+        with op.batch_alter_table("resumes") as batch_op:
+            batch_op.add_column(sa.Column("content_hash", sa.String(), nullable=True))
+    _create_index("ix_resumes_content_hash", "resumes", ["content_hash"], unique=True)
+
+    for table in ("resumes", "job_descriptions", "tailored_resumes"):
+        _create_index(f"ix_{table}_created_at", table, ["created_at"])
+
+    if not _has_table("resume_uploads"):
+        op.create_table(
+            "resume_uploads",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("resume_id", sa.Integer(), nullable=False),
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+        )
+    _create_index("ix_resume_uploads_id", "resume_uploads", ["id"])
+    _create_index("ix_resume_uploads_resume_id", "resume_uploads", ["resume_id"])
+
+    if not _has_table("pdf_artifacts"):
+        op.create_table(
+            "pdf_artifacts",
+            sa.Column("filename", sa.String(), primary_key=True),
+            sa.Column("content_hash", sa.String(), nullable=False),
+            sa.Column("template_name", sa.String(), nullable=False),
+            sa.Column("ref_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        )
+    _create_index("ix_pdf_artifacts_content_hash", "pdf_artifacts", ["content_hash"], unique=True)
+    _create_index("ix_pdf_artifacts_last_used_at", "pdf_artifacts", ["last_used_at"])
+
+    if not _has_table("tailoring_jobs"):
+        op.create_table(
+            "tailoring_jobs",
+            sa.Column("id", sa.String(), primary_key=True),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("request", sa.Text(), nullable=False),
+            sa.Column("callback_url", sa.String(), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("max_attempts", sa.Integer(), nullable=False),
+            sa.Column("next_run_at", sa.DateTime(), nullable=True),
+            sa.Column("result", sa.Text(), nullable=True),
+            sa.Column("error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+    _create_index("ix_tailoring_jobs_status", "tailoring_jobs", ["status"])
+    _create_index("ix_tailoring_jobs_next_run_at", "tailoring_jobs", ["next_run_at"])
+
+    if not _has_table("job_description_keywords"):
+        op.create_table(
+            "job_description_keywords",
+            sa.Column("keyword", sa.String(), primary_key=True),
+            sa.Column("job_description_id", sa.Integer(), primary_key=True),
+            sa.Column("weight", sa.Float(), nullable=False),
+        )
+    _create_index(
+        "ix_job_description_keywords_job_description_id", "job_description_keywords", ["job_description_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("job_description_keywords")
+    op.drop_table("tailoring_jobs")
+    op.drop_table("pdf_artifacts")
+    op.drop_table("resume_uploads")
+    for table in ("resumes", "job_descriptions", "tailored_resumes"):
+        op.drop_index(f"ix_{table}_created_at", table_name=table)
+    op.drop_index("ix_resumes_content_hash", table_name="resumes")
+    with op.batch_alter_table("resumes") as batch_op:
+        batch_op.drop_column("content_hash")
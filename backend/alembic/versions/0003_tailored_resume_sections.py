@@ -0,0 +1,37 @@
+"""Per-section fingerprints for incremental re-tailoring
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2024-06-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tailored_resume_sections",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("tailored_resume_id", sa.Integer(), nullable=False),
+        sa.Column("section", sa.String(), nullable=False),
+        sa.Column("fingerprint", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_tailored_resume_sections_id", "tailored_resume_sections", ["id"])
+    op.create_index("ix_tailored_resume_sections_tailored_resume_id", "tailored_resume_sections", ["tailored_resume_id"])
+    op.create_index("ix_tailored_resume_sections_fingerprint", "tailored_resume_sections", ["fingerprint"])
+
+
+def downgrade() -> None:
+    op.drop_table("tailored_resume_sections")
@@ -0,0 +1,28 @@
+"""Measured page count on rendered PDFs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2024-06-22 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("pdf_artifacts") as batch_op:
+        batch_op.add_column(sa.Column("page_count", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("pdf_artifacts") as batch_op:
+        batch_op.drop_column("page_count")
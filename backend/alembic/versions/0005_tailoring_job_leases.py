@@ -0,0 +1,30 @@
+"""Lease expiry on tailoring jobs so only abandoned jobs are requeued
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2024-07-06 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("tailoring_jobs") as batch_op:
+        batch_op.add_column(sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_tailoring_jobs_lease_expires_at", ["lease_expires_at"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("tailoring_jobs") as batch_op:
+        batch_op.drop_index("ix_tailoring_jobs_lease_expires_at")
+        batch_op.drop_column("lease_expires_at")
@@ -0,0 +1,56 @@
+"""Index job descriptions stored before the skill index existed
+
+Runs once here instead of on every app startup, where concurrent workers
+raced to insert the same postings.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2024-07-13 00:00:00
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.jd_index import keyword_weights
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+job_descriptions = sa.table("job_descriptions", sa.column("id"), sa.column("extracted_keywords"))
+postings = sa.table(
+    "job_description_keywords", sa.column("keyword"), sa.column("job_description_id"), sa.column("weight")
+)
+
+
+def upgrade() -> None:
+    indexed = sa.select(postings.c.job_description_id).distinct()
+    rows = op.get_bind().execute(
+        sa.select(job_descriptions.c.id, job_descriptions.c.extracted_keywords)
+        .where(job_descriptions.c.extracted_keywords.isnot(None), job_descriptions.c.id.notin_(indexed))
+    ).all()
+
+    new_postings = []
+    for jd_id, extracted_keywords in rows:
+        try:
+            keywords_data = json.loads(extracted_keywords)
+        except ValueError:
+            continue
+        if isinstance(keywords_data, dict):
+            new_postings.extend(
+                {"keyword": keyword, "job_description_id": jd_id, "weight": weight}
+                for keyword, weight in keyword_weights(keywords_data).items()
+            )
+    if new_postings:
+        op.bulk_insert(postings, new_postings)
+
+
+def downgrade() -> None:
+    # Data only; the postings are valid under the previous revision too
+    pass
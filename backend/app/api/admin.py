@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+from typing import Optional
+import os
+
+from app.core.config import settings
+from app.core.profiling import request_profiler
+
+router = APIRouter()
+
+def require_profiling(x_profile_token: Optional[str] = Header(None)):
+    """Profiling endpoints only exist when profiling is enabled, and honour the token when one is set"""
+    
+    if not settings.profiling_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.profiling_token and x_profile_token != settings.profiling_token:
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+@router.get("/admin/profiles", dependencies=[Depends(require_profiling)])
+async def list_profiles():
+    """List captured request profiles, newest first"""
+    
+    return {"profiles": request_profiler.list_profiles()}
+
+@router.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_profiling)])
+async def download_profile(
+    profile_id: str,
+    format: str = Query("pstats", pattern="^(pstats|text)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls|ncalls)$")
+):
+    """Download a profile as a pstats file (snakeviz, pstats) or a text report"""
+    
+    try:
+        path = request_profiler.path_for(profile_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if format == "text":
+        return PlainTextResponse(request_profiler.summary(profile_id, sort))
+    
+    return FileResponse(
+        path=path,
+        filename=f"profile_{profile_id}.prof",
+        media_type="application/octet-stream"
+    )
@@ -1,25 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import json
 
 from app.core.database import get_db, JobDescription
-from app.models.schemas import JobDescriptionCreate, JobDescription as JobDescriptionSchema
-from app.services.ai_service import AIService
+from app.models.schemas import (
+    JobDescriptionCreate, JobDescription as JobDescriptionSchema, JobDescriptionSearchResponse, Page
+)
+from app.services.ai_service import AIService, get_ai_service
+from app.services import jd_index
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 @router.post("/upload-job-description", response_model=JobDescriptionSchema)
 async def upload_job_description(
     job_description: JobDescriptionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service)
 ):
     """Upload and process job description"""
     
     try:
-        # Initialize AI service
-        ai_service = AIService()
-        
         # Extract keywords and requirements
         keywords_data = await ai_service.extract_keywords_from_jd(job_description.content)
         
@@ -36,50 +38,78 @@ async def upload_job_description(
         )
         
         db.add(db_jd)
-        db.commit()
-        db.refresh(db_jd)
+        await db.flush()
+        await jd_index.index_job_description(db, db_jd.id, keywords_data)
+        await db.commit()
+        await db.refresh(db_jd)
         
         return db_jd
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing job description: {str(e)}")
 
-@router.get("/job-descriptions", response_model=List[JobDescriptionSchema])
-async def get_job_descriptions(db: Session = Depends(get_db)):
-    """Get all job descriptions"""
+@router.get("/job-descriptions", response_model=Page)
+async def get_job_descriptions(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get job descriptions, newest first, one keyset page at a time"""
+    
+    return await paginate(db, JobDescription, JobDescriptionSchema, cursor, limit, fields)
+
+@router.get("/job-descriptions/search", response_model=JobDescriptionSearchResponse)
+async def search_job_descriptions(
+    skills: str = Query(..., description="Comma-separated skills, e.g. python,aws"),
+    mode: str = Query("and", pattern="^(and|or)$"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find job descriptions by skill using the keyword index"""
+    
+    requested = [skill for skill in skills.split(",") if skill.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="At least one skill is required")
     
-    job_descriptions = db.query(JobDescription).order_by(JobDescription.created_at.desc()).all()
-    return job_descriptions
+    results = await jd_index.search(db, requested, match_all=(mode == "and"), limit=limit, offset=offset)
+    return {
+        "skills": list(dict.fromkeys(jd_index.normalize_keyword(skill) for skill in requested)),
+        "mode": mode,
+        "results": results
+    }
 
 @router.get("/job-description/{jd_id}", response_model=JobDescriptionSchema)
-async def get_job_description(jd_id: int, db: Session = Depends(get_db)):
+async def get_job_description(jd_id: int, db: AsyncSession = Depends(get_db)):
     """Get specific job description by ID"""
     
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    jd = await db.get(JobDescription, jd_id)
     if not jd:
         raise HTTPException(status_code=404, detail="Job description not found")
     
     return jd
 
 @router.delete("/job-description/{jd_id}")
-async def delete_job_description(jd_id: int, db: Session = Depends(get_db)):
+async def delete_job_description(jd_id: int, db: AsyncSession = Depends(get_db)):
     """Delete job description by ID"""
     
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    jd = await db.get(JobDescription, jd_id)
     if not jd:
         raise HTTPException(status_code=404, detail="Job description not found")
     
-    # Delete database record
-    db.delete(jd)
-    db.commit()
+    # Delete database record and its keyword postings
+    await jd_index.remove_job_description(db, jd.id)
+    await db.delete(jd)
+    await db.commit()
     
     return {"success": True, "message": "Job description deleted successfully"}
 
 @router.get("/job-description/{jd_id}/keywords")
-async def get_job_keywords(jd_id: int, db: Session = Depends(get_db)):
+async def get_job_keywords(jd_id: int, db: AsyncSession = Depends(get_db)):
     """Get extracted keywords for a job description"""
     
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    jd = await db.get(JobDescription, jd_id)
     if not jd:
         raise HTTPException(status_code=404, detail="Job description not found")
     
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, Resume
+from app.models.schemas import MatchRankingResponse, MatchScoreResponse
+from app.services.match_scorer import match_scorer
+
+router = APIRouter()
+
+async def _get_resume(db: AsyncSession, resume_id: int) -> Resume:
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
+
+@router.get("/match-score", response_model=MatchScoreResponse)
+async def get_match_score(resume_id: int, job_description_id: int, db: AsyncSession = Depends(get_db)):
+    """Score how well a resume matches a job description without calling OpenAI"""
+    
+    resume = await _get_resume(db, resume_id)
+    result = await match_scorer.score(db, resume.parsed_content, job_description_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    return {"resume_id": resume_id, **result}
+
+@router.get("/match-score/rank", response_model=MatchRankingResponse)
+async def rank_job_descriptions(
+    resume_id: int,
+    limit: int = Query(20, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rank every stored job description by match score for a resume"""
+    
+    resume = await _get_resume(db, resume_id)
+    matches = await match_scorer.rank(db, resume.parsed_content, limit)
+    
+    return {
+        "resume_id": resume_id,
+        "total_job_descriptions": len(match_scorer.documents),
+        "matches": matches
+    }
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, TailoringJob
+from app.core.metrics import TAILORING_JOBS, render_latest
+
+router = APIRouter()
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(db: AsyncSession = Depends(get_db)):
+    """Prometheus scrape endpoint"""
+    
+    # Queue depth lives in the database, so sample it per scrape
+    counts = dict((await db.execute(
+        select(TailoringJob.status, func.count()).group_by(TailoringJob.status)
+    )).all())
+    for status in JOB_STATUSES:
+        TAILORING_JOBS.labels(status=status).set(counts.get(status, 0))
+    
+    return Response(content=render_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -1,47 +1,69 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 import os
-import aiofiles
+import uuid
 from datetime import datetime
 
-from app.core.database import get_db, Resume
-from app.models.schemas import UploadResponse, Resume as ResumeSchema
+from app.core.database import get_db, Resume, ResumeUpload
+from app.models.schemas import UploadResponse, Page, Resume as ResumeSchema
 from app.utils.document_parser import DocumentParser
+from app.utils.upload_stream import save_upload
+from app.utils.pagination import paginate
 from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS, record_cache_lookup, timed
 
 router = APIRouter()
 
 @router.post("/upload-resume", response_model=UploadResponse)
 async def upload_resume(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Upload and parse resume file"""
     
     try:
-        # Validate file size
-        if file.size and file.size > settings.max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {settings.max_file_size // (1024*1024)}MB"
-            )
+        # Reject unsupported types before writing anything
+        file_extension = DocumentParser.validate_file_type(file.filename)
+        
+        # Ensure upload directory exists
+        os.makedirs(settings.upload_dir, exist_ok=True)
+        
+        # Stream to a temporary file first; the size limit is enforced on the bytes actually received
+        temp_path = os.path.join(settings.upload_dir, f".{uuid.uuid4().hex}.part")
+        with timed(STAGE_SECONDS, stage="upload_write"):
+            saved = await save_upload(file, temp_path, settings.max_file_size)
         
-        # Parse document
-        parsed_data = await DocumentParser.parse_document(file)
+        # Identical bytes were parsed before: record the upload and reuse the existing resume
+        existing = await db.scalar(select(Resume).where(Resume.content_hash == saved["sha256"]))
+        record_cache_lookup("resume_upload", existing is not None)
+        if existing:
+            os.remove(temp_path)
+            db.add(ResumeUpload(resume_id=existing.id, filename=file.filename, size=saved["size"]))
+            with timed(STAGE_SECONDS, stage="upload_commit"):
+                await db.commit()
+            
+            return UploadResponse(
+                success=True,
+                message="Resume already uploaded; reusing parsed content",
+                file_id=existing.id,
+                filename=file.filename,
+                duplicate=True
+            )
         
-        # Save file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.filename}"
+        filename = f"{timestamp}_{os.path.basename(file.filename)}"
         file_path = os.path.join(settings.upload_dir, filename)
+        os.replace(temp_path, file_path)
         
-        # Ensure upload directory exists
-        os.makedirs(settings.upload_dir, exist_ok=True)
-        
-        # Save file content
-        content = await file.read()
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        # Parse the saved file in the parse pool
+        try:
+            parsed_data = await DocumentParser.parse_saved_file(file_path, file_extension)
+        except Exception:
+            os.remove(file_path)
+            raise
         
         # Create database record
         db_resume = Resume(
@@ -49,12 +71,22 @@ async def upload_resume(
             original_content=parsed_data["content"],
             parsed_content=parsed_data["content"],
             file_path=file_path,
-            file_type=parsed_data["file_type"]
+            file_type=parsed_data["file_type"],
+            content_hash=saved["sha256"]
         )
         
-        db.add(db_resume)
-        db.commit()
-        db.refresh(db_resume)
+        try:
+            db.add(db_resume)
+            await db.flush()
+        except IntegrityError:
+            # A concurrent upload of the same bytes won the insert; point at its record instead
+            await db.rollback()
+            os.remove(file_path)
+            db_resume = await db.scalar(select(Resume).where(Resume.content_hash == saved["sha256"]))
+        
+        db.add(ResumeUpload(resume_id=db_resume.id, filename=file.filename, size=saved["size"]))
+        with timed(STAGE_SECONDS, stage="upload_commit"):
+            await db.commit()
         
         return UploadResponse(
             success=True,
@@ -63,31 +95,37 @@ async def upload_resume(
             filename=file.filename
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error uploading resume: {str(e)}")
 
-@router.get("/resumes", response_model=List[ResumeSchema])
-async def get_resumes(db: Session = Depends(get_db)):
-    """Get all uploaded resumes"""
+@router.get("/resumes", response_model=Page)
+async def get_resumes(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get uploaded resumes, newest first, one keyset page at a time"""
     
-    resumes = db.query(Resume).order_by(Resume.created_at.desc()).all()
-    return resumes
+    return await paginate(db, Resume, ResumeSchema, cursor, limit, fields)
 
 @router.get("/resume/{resume_id}", response_model=ResumeSchema)
-async def get_resume(resume_id: int, db: Session = Depends(get_db)):
+async def get_resume(resume_id: int, db: AsyncSession = Depends(get_db)):
     """Get specific resume by ID"""
     
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
     return resume
 
 @router.delete("/resume/{resume_id}")
-async def delete_resume(resume_id: int, db: Session = Depends(get_db)):
+async def delete_resume(resume_id: int, db: AsyncSession = Depends(get_db)):
     """Delete resume by ID"""
     
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
@@ -95,8 +133,9 @@ async def delete_resume(resume_id: int, db: Session = Depends(get_db)):
     if os.path.exists(resume.file_path):
         os.remove(resume.file_path)
     
-    # Delete database record
-    db.delete(resume)
-    db.commit()
+    # Delete database record and its upload history
+    await db.execute(delete(ResumeUpload).where(ResumeUpload.resume_id == resume_id))
+    await db.delete(resume)
+    await db.commit()
     
     return {"success": True, "message": "Resume deleted successfully"} 
\ No newline at end of file
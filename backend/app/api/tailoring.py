@@ -1,133 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 import json
+from typing import Optional
 
-from app.core.database import get_db, Resume, JobDescription, TailoredResume
-from app.models.schemas import TailoringRequest, TailoringResponse, DownloadResponse
-from app.services.ai_service import AIService
-from app.utils.pdf_generator import PDFGenerator
+from app.core.database import get_db, Resume, TailoredResume, TailoringJob
+from app.models.schemas import (
+    TailoringRequest, TailoringResponse, BatchTailoringRequest, TailoringJobRequest, TailoringJobStatus, DownloadResponse,
+    BulkDownloadRequest, Page, TailoredResume as TailoredResumeSchema
+)
+from app.services.ai_service import AIService, get_ai_service
+from app.services.tailoring_service import (
+    tailor_and_store, load_tailoring_inputs, stream_tailoring, stream_batch_tailoring
+)
+from app.services.job_queue import job_queue
+from app.services.pdf_store import pdf_store
+from app.services.pdf_export import attach_pdf, build_resume_data, stream_bulk_pdfs
+from app.utils.pdf_generator import PDFGenerator, render_pool
+from app.core.worker_pool import WorkerPoolSaturated, WorkerPoolTimeout
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 @router.post("/tailor-resume", response_model=TailoringResponse)
 async def tailor_resume(
     request: TailoringRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service)
 ):
     """Tailor resume for specific job description"""
     
     try:
-        # Get resume and job description
-        resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
-        if not resume:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        job_description = db.query(JobDescription).filter(JobDescription.id == request.job_description_id).first()
-        if not job_description:
-            raise HTTPException(status_code=404, detail="Job description not found")
-        
-        # Initialize AI service
-        ai_service = AIService()
-        
-        # Get keywords from job description
-        keywords = json.loads(job_description.extracted_keywords) if job_description.extracted_keywords else {}
-        
-        # Tailor resume
-        tailored_sections = await ai_service.tailor_resume(
-            resume_content=resume.parsed_content,
-            job_description=job_description.content,
-            keywords=keywords,
-            preserve_formatting=request.preserve_formatting
-        )
-        
-        # Combine sections into full content
-        tailored_content = "\n\n".join([
-            tailored_sections.get("contact", ""),
-            tailored_sections.get("summary", ""),
-            tailored_sections.get("experience", ""),
-            tailored_sections.get("education", ""),
-            tailored_sections.get("skills", ""),
-            tailored_sections.get("projects", ""),
-            tailored_sections.get("certifications", "")
-        ]).strip()
-        
-        # Create database record
-        db_tailored = TailoredResume(
-            resume_id=request.resume_id,
-            job_description_id=request.job_description_id,
-            tailored_content=tailored_content,
-            is_one_page=tailored_sections.get("estimated_pages", 1.0) <= 1.0
-        )
-        
-        db.add(db_tailored)
-        db.commit()
-        db.refresh(db_tailored)
-        
-        return TailoringResponse(
-            success=True,
-            message="Resume tailored successfully",
-            tailored_resume_id=db_tailored.id,
-            preview_content=tailored_content[:500] + "..." if len(tailored_content) > 500 else tailored_content,
-            estimated_pages=tailored_sections.get("estimated_pages", 1.0)
-        )
-        
+        return await tailor_and_store(db, request, ai_service)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error tailoring resume: {str(e)}")
 
+@router.post("/tailor-resume/stream")
+async def tailor_resume_stream(
+    request: TailoringRequest,
+    db: AsyncSession = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """Tailor resume and stream each finished section as a server-sent event"""
+    
+    # Resolve inputs up front so missing records are still plain 404s
+    resume, job_description, keywords = await load_tailoring_inputs(db, request)
+    
+    async def event_stream():
+        try:
+            async for event, data in stream_tailoring(db, request, resume, job_description, keywords, ai_service):
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"message": f"Error tailoring resume: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/tailor-resume/batch")
+async def tailor_resume_batch(
+    request: BatchTailoringRequest,
+    db: AsyncSession = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """Tailor one resume against many job descriptions, streaming each result as it completes"""
+    
+    resume = await db.get(Resume, request.resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    async def event_stream():
+        try:
+            async for event, data in stream_batch_tailoring(db, request, resume, ai_service):
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"message": f"Error tailoring resumes: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/tailor-resume/jobs", response_model=TailoringJobStatus, status_code=202)
+async def submit_tailoring_job(
+    request: TailoringJobRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue resume tailoring and return a job id to poll"""
+    
+    job = await job_queue.enqueue(db, request)
+    return _job_status(job)
+
+@router.get("/jobs/{job_id}", response_model=TailoringJobStatus)
+async def get_tailoring_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Get the status and result of a tailoring job"""
+    
+    job = await db.get(TailoringJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return _job_status(job)
+
+def _job_status(job: TailoringJob) -> TailoringJobStatus:
+    return TailoringJobStatus(
+        job_id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
 @router.post("/generate-pdf/{tailored_resume_id}", response_model=DownloadResponse)
 async def generate_pdf(
     tailored_resume_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Generate PDF for tailored resume"""
     
     try:
         # Get tailored resume
-        tailored_resume = db.query(TailoredResume).filter(TailoredResume.id == tailored_resume_id).first()
+        tailored_resume = await db.get(TailoredResume, tailored_resume_id)
         if not tailored_resume:
             raise HTTPException(status_code=404, detail="Tailored resume not found")
         
         # Get original resume for additional context
-        original_resume = db.query(Resume).filter(Resume.id == tailored_resume.resume_id).first()
+        original_resume = await db.get(Resume, tailored_resume.resume_id)
         
         # Initialize PDF generator
         pdf_generator = PDFGenerator()
         
-        # Extract sections from tailored content
-        sections = pdf_generator.create_resume_data({
-            "contact": original_resume.parsed_content.split('\n')[0] if original_resume.parsed_content else "",
-            "summary": "",
-            "experience": tailored_resume.tailored_content,
-            "education": "",
-            "skills": "",
-            "projects": "",
-            "certifications": ""
-        })
+        sections = build_resume_data(pdf_generator, tailored_resume, original_resume)
         
-        # Generate PDF
-        pdf_filename = pdf_generator.generate_pdf(sections)
+        # Reuse the stored PDF for identical content, otherwise render on the render pool
+        try:
+            artifact = await pdf_store.get_or_render(db, sections, pdf_generator=pdf_generator)
+        except WorkerPoolSaturated:
+            raise HTTPException(status_code=429, detail="PDF renderer is busy, please retry shortly")
+        except WorkerPoolTimeout:
+            raise HTTPException(status_code=504, detail="Timed out generating PDF")
         
         # Update database with PDF path
-        tailored_resume.pdf_path = pdf_filename
-        db.commit()
+        await attach_pdf(db, tailored_resume, artifact)
+        await db.commit()
         
         return DownloadResponse(
             success=True,
             message="PDF generated successfully",
             download_url=f"/api/download/{tailored_resume_id}",
-            filename=pdf_filename
+            filename=artifact.filename,
+            page_count=artifact.page_count
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
 
+@router.get("/pdf-render-stats")
+async def get_pdf_render_stats():
+    """Get render pool queue depth and per-render latency"""
+    
+    return render_pool.get_stats()
+
 @router.get("/download/{tailored_resume_id}")
-async def download_pdf(tailored_resume_id: int, db: Session = Depends(get_db)):
+async def download_pdf(tailored_resume_id: int, db: AsyncSession = Depends(get_db)):
     """Download generated PDF"""
     
-    tailored_resume = db.query(TailoredResume).filter(TailoredResume.id == tailored_resume_id).first()
+    tailored_resume = await db.get(TailoredResume, tailored_resume_id)
     if not tailored_resume:
         raise HTTPException(status_code=404, detail="Tailored resume not found")
     
@@ -144,18 +195,42 @@ async def download_pdf(tailored_resume_id: int, db: Session = Depends(get_db)):
         media_type="application/pdf"
     )
 
-@router.get("/tailored-resumes")
-async def get_tailored_resumes(db: Session = Depends(get_db)):
-    """Get all tailored resumes"""
+@router.post("/download/bulk")
+async def download_bulk(request: BulkDownloadRequest, db: AsyncSession = Depends(get_db)):
+    """Download many tailored resumes as one streamed ZIP, rendering any missing PDFs in parallel"""
+    
+    tailored_resume_ids = list(dict.fromkeys(request.tailored_resume_ids))
+    tailored_resumes = {
+        tailored_resume.id: tailored_resume for tailored_resume in
+        await db.scalars(select(TailoredResume).where(TailoredResume.id.in_(tailored_resume_ids)))
+    }
+    missing = [str(tailored_resume_id) for tailored_resume_id in tailored_resume_ids if tailored_resume_id not in tailored_resumes]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tailored resumes not found: {', '.join(missing)}")
+    
+    # No Content-Length, so the archive goes out with chunked transfer encoding as it is built
+    return StreamingResponse(
+        stream_bulk_pdfs(db, [tailored_resumes[tailored_resume_id] for tailored_resume_id in tailored_resume_ids]),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="tailored_resumes.zip"'}
+    )
+
+@router.get("/tailored-resumes", response_model=Page)
+async def get_tailored_resumes(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get tailored resumes, newest first, one keyset page at a time"""
     
-    tailored_resumes = db.query(TailoredResume).order_by(TailoredResume.created_at.desc()).all()
-    return tailored_resumes
+    return await paginate(db, TailoredResume, TailoredResumeSchema, cursor, limit, fields)
 
 @router.get("/tailored-resume/{tailored_resume_id}")
-async def get_tailored_resume(tailored_resume_id: int, db: Session = Depends(get_db)):
+async def get_tailored_resume(tailored_resume_id: int, db: AsyncSession = Depends(get_db)):
     """Get specific tailored resume"""
     
-    tailored_resume = db.query(TailoredResume).filter(TailoredResume.id == tailored_resume_id).first()
+    tailored_resume = await db.get(TailoredResume, tailored_resume_id)
     if not tailored_resume:
         raise HTTPException(status_code=404, detail="Tailored resume not found")
     
@@ -9,17 +9,50 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./resume_optimizer.db"
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_echo: bool = False
+    sqlite_busy_timeout_ms: int = 5000
+    run_migrations_on_startup: bool = True
     
     # OpenAI Configuration
     openai_api_key: str
+    openai_base_url: Optional[str] = None  # e.g. a proxy, or the benchmark stub server
+    openai_max_connections: int = 20
+    openai_max_concurrency: int = 8
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 80000
+    openai_max_retries: int = 4
+    openai_retry_base_seconds: float = 1.0
+    openai_timeout_seconds: float = 120.0
     
     # File Upload Configuration
     upload_dir: str = "uploads"
     max_file_size: int = 10 * 1024 * 1024  # 10MB
     allowed_file_types: list = [".pdf", ".docx", ".txt"]
     
+    # Document Parsing Worker Pool
+    parse_pool_workers: int = 2
+    parse_pool_max_pending: int = 32
+    parse_job_timeout_seconds: float = 30.0
+    parse_pool_max_jobs_per_worker: int = 50
+    
     # PDF Generation
     pdf_output_dir: str = "static/pdfs"
+    template_cache_dir: str = "cache/jinja"
+    pdf_sweep_interval_seconds: int = 3600
+    pdf_sweep_grace_seconds: int = 3600
+    render_pool_workers: int = 2
+    render_pool_max_pending: int = 16
+    render_job_timeout_seconds: float = 60.0
+    render_pool_max_jobs_per_worker: int = 200
+    pdf_fit_target_pages: int = 1
+    pdf_fit_max_passes: int = 8  # layout passes per render, including the full-size and floor layouts
+    pdf_fit_min_font_scale: float = 0.8
+    pdf_fit_min_margin_scale: float = 0.5
+    pdf_fit_tolerance: float = 0.02
     
     # Security
     secret_key: str = "your-secret-key-here"
@@ -30,6 +63,45 @@ class Settings(BaseSettings):
     gpt_model: str = "gpt-4"
     max_tokens: int = 4000
     temperature: float = 0.7
+    tailoring_context_tokens: int = 8192
+    tailoring_min_output_tokens: int = 1200
+    tailoring_section_min_output_tokens: int = 300
+    tailoring_mode: str = "full"  # "full" (one prompt) or "sections" (one concurrent prompt per section)
+    tailoring_prompt_version: str = "v1"  # bump when tailoring prompts change to invalidate cached sections
+    tiktoken_allow_download: bool = False  # exact token counts need tiktoken's BPE file; only fetch it if allowed
+    
+    # Batch Tailoring
+    batch_tailoring_concurrency: int = 5
+    
+    # Tailoring Job Queue
+    tailoring_job_workers: int = 4
+    tailoring_job_max_attempts: int = 3
+    tailoring_job_backoff_seconds: float = 5.0
+    tailoring_job_poll_seconds: float = 1.0
+    tailoring_job_lease_seconds: float = 60.0
+    job_callback_timeout_seconds: float = 10.0
+    job_callback_allow_private: bool = False  # allow callbacks to localhost/private networks (development only)
+    
+    # LLM Response Cache
+    llm_cache_path: str = "cache/llm_cache.db"
+    llm_cache_memory_entries: int = 256
+    llm_cache_max_entries: int = 10000
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600
+    keyword_prompt_version: str = "v1"
+    
+    # Local Keyword Extraction
+    local_keyword_first_pass: bool = True
+    local_keyword_confidence_threshold: float = 0.8
+    local_keyword_min_skills: int = 6
+    local_keyword_idf_corpus_size: int = 1000
+    
+    # Request Profiling (debug only; the middleware isn't installed unless enabled)
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.0  # fraction of requests profiled without the header
+    profiling_header: str = "X-Profile"
+    profiling_token: str = ""  # when set, the header and admin endpoints must carry this value
+    profiling_dir: str = "profiles"
+    profiling_max_profiles: int = 200
     
     class Config:
         env_file = ".env"
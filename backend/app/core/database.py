@@ -1,28 +1,69 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from datetime import datetime
 from app.core.config import settings
 
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Map a plain database URL (sqlite:///..., postgresql://...) to its async driver"""
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)).render_as_string(hide_password=False)
+
+def create_engine_for(url: str, **kwargs):
+    """Async engine with pool sizing; SQLite connections get WAL mode and dev-friendly pragmas"""
+    url = async_database_url(url)
+    is_sqlite = url.startswith("sqlite")
+    options = {"echo": settings.db_echo, "pool_pre_ping": not is_sqlite}
+    if ":memory:" not in url and "poolclass" not in kwargs:
+        # aiosqlite defaults to NullPool (a new thread and connection per checkout); pool like the other drivers
+        if is_sqlite:
+            options["poolclass"] = AsyncAdaptedQueuePool
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds
+        )
+    options.update(kwargs)
+    async_engine = create_async_engine(url, **options)
+    
+    if is_sqlite:
+        @event.listens_for(async_engine.sync_engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            # WAL lets readers run alongside a writer, so several uvicorn workers can share the file
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-32000")
+            cursor.close()
+    
+    return async_engine
+
 # Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+engine = create_engine_for(settings.database_url)
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory; objects stay usable after commit, since lazy loads are not possible in async code
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Create Base class
 Base = declarative_base()
 
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Models
 class Resume(Base):
@@ -34,9 +75,19 @@ class Resume(Base):
     parsed_content = Column(Text, nullable=False)
     file_path = Column(String, nullable=False)
     file_type = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    content_hash = Column(String, nullable=True, unique=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class ResumeUpload(Base):
+    __tablename__ = "resume_uploads"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
     
@@ -46,7 +97,7 @@ class JobDescription(Base):
     content = Column(Text, nullable=False)
     extracted_keywords = Column(Text, nullable=True)
     requirements = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
 class TailoredResume(Base):
     __tablename__ = "tailored_resumes"
@@ -57,4 +108,51 @@ class TailoredResume(Base):
     tailored_content = Column(Text, nullable=False)
     pdf_path = Column(String, nullable=True)
     is_one_page = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow, index=True) 
+
+class PDFArtifact(Base):
+    __tablename__ = "pdf_artifacts"
+    
+    filename = Column(String, primary_key=True)
+    content_hash = Column(String, nullable=False, unique=True, index=True)
+    template_name = Column(String, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    page_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class TailoringJob(Base):
+    __tablename__ = "tailoring_jobs"
+    
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, default="queued", index=True)
+    request = Column(Text, nullable=False)
+    callback_url = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    next_run_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Extended by the running worker's heartbeat; once it lapses any worker may take the job over
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class JobDescriptionKeyword(Base):
+    __tablename__ = "job_description_keywords"
+    
+    # Inverted index: (keyword, jd id) is the lookup order, so it is the primary key
+    keyword = Column(String, primary_key=True)
+    job_description_id = Column(Integer, primary_key=True, index=True)
+    weight = Column(Float, nullable=False, default=1.0)
+
+class TailoredResumeSection(Base):
+    __tablename__ = "tailored_resume_sections"
+    
+    # Rewritten section output keyed by a fingerprint of everything that produced it
+    id = Column(Integer, primary_key=True, index=True)
+    tailored_resume_id = Column(Integer, nullable=False, index=True)
+    section = Column(String, nullable=False)
+    fingerprint = Column(String, nullable=False, index=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,174 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict, Optional
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, ProcessCollector, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+NAMESPACE = "resume_optimizer"
+
+# Own registry so importing the app twice (tests, reloads) never double-registers
+registry = CollectorRegistry()
+ProcessCollector(registry=registry)
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds", "HTTP request latency by route template",
+    ["method", "route", "status"], namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+STAGE_SECONDS = Histogram(
+    "stage_seconds", "Time spent in one pipeline stage",
+    ["stage"], namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+PARSE_SECONDS = Histogram(
+    "parse_seconds", "Document parse time per file type, including parse pool queueing",
+    ["file_type"], namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_seconds", "OpenAI call latency per operation",
+    ["operation"], namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens per OpenAI call",
+    ["operation", "kind"], namespace=NAMESPACE, buckets=TOKEN_BUCKETS, registry=registry
+)
+PDF_RENDER_SECONDS = Histogram(
+    "pdf_render_seconds", "WeasyPrint layout and PDF write time inside a render worker",
+    namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+PDF_FIT_PASSES = Histogram(
+    "pdf_fit_passes", "Layout passes the page fitter needed per PDF",
+    namespace=NAMESPACE, buckets=(1, 2, 3, 4, 5, 6, 8, 10, 12), registry=registry
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds", "Database statement time by statement type",
+    ["statement"], namespace=NAMESPACE, buckets=LATENCY_BUCKETS, registry=registry
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups", "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"], namespace=NAMESPACE, registry=registry
+)
+TAILORING_JOBS = Gauge(
+    "tailoring_jobs", "Tailoring jobs by status, sampled at scrape time",
+    ["status"], namespace=NAMESPACE, registry=registry
+)
+
+
+class timed:
+    """Observe elapsed seconds into a histogram; use as a context manager or on (async) functions"""
+
+    def __init__(self, histogram: Histogram, **labels: str):
+        self.metric = histogram.labels(**labels) if labels else histogram
+        self.start = 0.0
+
+    def __enter__(self) -> "timed":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self.metric.observe(time.perf_counter() - self.start)
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        metric = self.metric
+
+        # A fresh start time per call, so concurrent calls don't share one
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def wrap_async_gen(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                finally:
+                    metric.observe(time.perf_counter() - start)
+            return wrap_async_gen
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrap_async(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    metric.observe(time.perf_counter() - start)
+            return wrap_async
+
+        @functools.wraps(func)
+        def wrap(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metric.observe(time.perf_counter() - start)
+        return wrap
+
+
+def record_llm_usage(operation: str, usage: Optional[Dict[str, int]]):
+    """Record prompt and completion token counts for one OpenAI call"""
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            LLM_TOKENS.labels(operation=operation, kind=kind.split("_")[0]).observe(usage[kind])
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1):
+    if count:
+        CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc(count)
+
+
+class StatsCollector:
+    """Expose the numeric fields of existing get_stats() dicts as gauges at scrape time"""
+
+    def __init__(self):
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def add(self, name: str, get_stats: Callable[[], Dict[str, Any]]):
+        self.sources[name] = get_stats
+
+    def collect(self):
+        for name, get_stats in self.sources.items():
+            try:
+                stats = get_stats()
+            except Exception as e:
+                print(f"Error collecting {name} stats: {e}")
+                continue
+            for key, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"{NAMESPACE}_{name}_{key}", f"{name} {key.replace('_', ' ')}", value=value)
+
+
+stats_collector = StatsCollector()
+registry.register(stats_collector)
+
+
+def instrument_engine(engine: AsyncEngine):
+    """Time every statement run on an engine, labelled by statement type"""
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _observe(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        statement_type = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DB_QUERY_SECONDS.labels(statement=statement_type).observe(elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _discard_timer(context):
+        # after_cursor_execute doesn't fire for failed statements
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+
+def render_latest() -> bytes:
+    return generate_latest(registry)
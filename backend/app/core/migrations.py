@@ -0,0 +1,21 @@
+import os
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config() -> Config:
+    """Alembic config that works regardless of the current working directory"""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def run_migrations():
+    """Upgrade the database to the latest revision
+
+    env.py drives its own event loop, so call this from a thread (or before the app's loop starts).
+    """
+    command.upgrade(alembic_config(), "head")
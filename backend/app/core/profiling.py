@@ -0,0 +1,148 @@
+import asyncio
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import Request
+
+from app.core.config import settings
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class RequestProfiler:
+    """Run sampled requests under cProfile and keep the pstats output keyed by request id
+    
+    cProfile traces the event loop thread, so a profile also includes whatever other
+    requests ran while it was recording; only one request is profiled at a time.
+    Parsing and rendering happen in worker processes and are not captured.
+    """
+    
+    def __init__(self, directory: str, sample_rate: float, header: str, token: str, max_profiles: int):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.header = header
+        self.token = token
+        self.max_profiles = max_profiles
+        # cProfile allows one active profiler per thread
+        self._active = threading.Lock()
+    
+    def is_authorized(self, value: Optional[str]) -> bool:
+        if self.token:
+            return value == self.token
+        return bool(value)
+    
+    def should_profile(self, request: Request) -> bool:
+        value = request.headers.get(self.header)
+        if value is not None:
+            return self.is_authorized(value)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    async def handle(self, request: Request, call_next):
+        """Middleware body: pass through unless this request is sampled and no profile is running"""
+        
+        if not self.should_profile(request) or not self._active.acquire(blocking=False):
+            return await call_next(request)
+        
+        profile_id = uuid.uuid4().hex
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (a debugger, coverage) already owns this thread
+            self._active.release()
+            return await call_next(request)
+        try:
+            response = await call_next(request)
+        except BaseException:
+            profiler.disable()
+            self._active.release()
+            raise
+        
+        body = response.body_iterator
+        
+        async def profiled_body():
+            # Streamed bodies are produced after call_next returns; keep recording until they finish
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                profiler.disable()
+                self._active.release()
+                metadata = {
+                    "id": profile_id,
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status": response.status_code,
+                    "duration_seconds": round(time.perf_counter() - start, 4),
+                    "created_at": datetime.utcnow().isoformat()
+                }
+                try:
+                    await asyncio.to_thread(self.save, profiler, metadata)
+                except Exception as e:
+                    print(f"Error saving request profile: {e}")
+        
+        response.body_iterator = profiled_body()
+        response.headers["X-Profile-Id"] = profile_id
+        return response
+    
+    def save(self, profiler: cProfile.Profile, metadata: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        profiler.dump_stats(self.path_for(metadata["id"]))
+        with open(os.path.join(self.directory, f"{metadata['id']}.json"), "w") as f:
+            json.dump(metadata, f)
+        self.prune()
+    
+    def prune(self):
+        """Keep only the newest max_profiles profiles"""
+        profiles = self.list_profiles()
+        for metadata in profiles[self.max_profiles:]:
+            for suffix in (".prof", ".json"):
+                path = os.path.join(self.directory, f"{metadata['id']}{suffix}")
+                if os.path.exists(path):
+                    os.remove(path)
+    
+    def path_for(self, profile_id: str) -> str:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            raise ValueError("Invalid profile id")
+        return os.path.join(self.directory, f"{profile_id}.prof")
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Profile metadata, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda metadata: metadata.get("created_at", ""), reverse=True)
+    
+    def summary(self, profile_id: str, sort: str = "cumulative", limit: int = 50) -> str:
+        """pstats text report for one profile"""
+        stream = io.StringIO()
+        stats = pstats.Stats(self.path_for(profile_id), stream=stream)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+
+request_profiler = RequestProfiler(
+    directory=settings.profiling_dir,
+    sample_rate=settings.profiling_sample_rate,
+    header=settings.profiling_header,
+    token=settings.profiling_token,
+    max_profiles=settings.profiling_max_profiles
+)
@@ -0,0 +1,181 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+
+# Forking a process that runs an event loop and other threads can copy locks held mid-operation;
+# forkserver children start from a clean single-threaded server instead (spawn where unavailable)
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class WorkerPoolSaturated(Exception):
+    """Raised when a worker pool's bounded queue is full"""
+
+
+class WorkerPoolTimeout(Exception):
+    """Raised when a job exceeds the pool's per-job timeout"""
+
+
+def _noop():
+    return None
+
+
+class _Generation:
+    """One ProcessPoolExecutor plus the bookkeeping needed to retire it"""
+
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+        self.submitted = 0
+        self.active: Set[Future] = set()
+        self.hung: Set[Future] = set()
+        self.retired = False
+        self.closed = False
+
+    def can_shutdown(self) -> bool:
+        return self.retired and not self.closed and not (self.active - self.hung)
+
+    def shutdown(self):
+        self.closed = True
+        if self.hung:
+            # Hung workers never return on their own; kill them so they stop burning CPU
+            for process in list((getattr(self.executor, "_processes", None) or {}).values()):
+                process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ProcessWorkerPool:
+    """Bounded, recycling process pool for CPU-bound work called from async code"""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_pending: int,
+        timeout_seconds: float,
+        max_jobs_per_worker: int = 0,
+        initializer: Optional[Callable[..., Any]] = None
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.initializer = initializer
+        self._lock = threading.RLock()
+        self._generation: Optional[_Generation] = None
+        self._pending = 0
+        self._latencies: deque = deque(maxlen=1000)
+        self.stats = {"completed": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or running"""
+        return self._pending
+
+    def _current_generation(self) -> _Generation:
+        generation = self._generation
+        if generation is not None and getattr(generation.executor, "_broken", False):
+            # A worker died (e.g. OOM-killed); start over with a fresh executor
+            self._retire(generation)
+            generation = None
+        if generation is not None and self.max_jobs_per_worker:
+            # Recycle workers after N jobs each to release memory the libraries never give back
+            if generation.submitted >= self.max_jobs_per_worker * self.max_workers:
+                self._retire(generation)
+                generation = None
+        if generation is None:
+            generation = _Generation(
+                ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=_MP_CONTEXT, initializer=self.initializer
+                )
+            )
+            self._generation = generation
+        return generation
+
+    def _retire(self, generation: _Generation):
+        generation.retired = True
+        if self._generation is generation:
+            self._generation = None
+        if generation.can_shutdown():
+            generation.shutdown()
+
+    def _job_finished(self, generation: _Generation, future: Future):
+        with self._lock:
+            generation.active.discard(future)
+            if generation.can_shutdown():
+                generation.shutdown()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in a worker process without blocking the event loop"""
+
+        started = time.perf_counter()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise WorkerPoolSaturated(f"{self.name} pool is saturated")
+            generation = self._current_generation()
+            future = generation.executor.submit(fn, *args)
+            self._pending += 1
+            generation.submitted += 1
+            generation.active.add(future)
+
+        future.add_done_callback(lambda f: self._job_finished(generation, f))
+
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout_seconds)
+            with self._lock:
+                self.stats["completed"] += 1
+                self._latencies.append(time.perf_counter() - started)
+            return result
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.stats["timed_out"] += 1
+                # Jobs cancelled while still queued never reached a worker
+                if not future.done():
+                    generation.hung.add(future)
+                    self._retire(generation)
+            raise WorkerPoolTimeout(
+                f"{self.name} job exceeded {self.timeout_seconds}s timeout"
+            )
+        except Exception:
+            with self._lock:
+                self.stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def warm_up(self):
+        """Start the worker processes (running the initializer) before the first real job"""
+        with self._lock:
+            generation = self._current_generation()
+            generation.executor.submit(_noop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return job counters and latency percentiles (seconds) over recent jobs"""
+        with self._lock:
+            stats = dict(self.stats)
+            latencies = sorted(self._latencies)
+        stats["pending"] = self._pending
+        stats["workers"] = self.max_workers
+        if latencies:
+            stats["latency_p50"] = latencies[len(latencies) // 2]
+            stats["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            stats["latency_max"] = latencies[-1]
+        return stats
+
+    def shutdown(self):
+        """Stop all workers; called on application shutdown"""
+        with self._lock:
+            if self._generation is not None:
+                generation = self._generation
+                self._generation = None
+                generation.retired = True
+                if not generation.closed:
+                    generation.shutdown()
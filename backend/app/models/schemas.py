@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Any, Dict, Literal, Optional, List
 from datetime import datetime
 
 # Resume Schemas
@@ -63,12 +63,14 @@ class UploadResponse(BaseModel):
     message: str
     file_id: Optional[int] = None
     filename: Optional[str] = None
+    duplicate: bool = False
 
 class TailoringRequest(BaseModel):
     resume_id: int
     job_description_id: int
     preserve_formatting: bool = True
     target_length: Optional[str] = "one_page"
+    mode: Optional[Literal["full", "sections"]] = None
 
 class TailoringResponse(BaseModel):
     success: bool
@@ -76,12 +78,74 @@ class TailoringResponse(BaseModel):
     tailored_resume_id: Optional[int] = None
     preview_content: Optional[str] = None
     estimated_pages: Optional[float] = None
+    token_usage: Optional[Dict[str, int]] = None
+    reused_sections: List[str] = []
+
+class BatchTailoringRequest(BaseModel):
+    resume_id: int
+    job_description_ids: List[int] = Field(..., min_length=1, max_length=100)
+    preserve_formatting: bool = True
+    target_length: Optional[str] = "one_page"
+    mode: Optional[Literal["full", "sections"]] = None
+
+class BulkDownloadRequest(BaseModel):
+    tailored_resume_ids: List[int] = Field(..., min_length=1, max_length=200)
+
+class TailoringJobRequest(TailoringRequest):
+    callback_url: Optional[str] = None
+
+class TailoringJobStatus(BaseModel):
+    job_id: str
+    status: str
+    attempts: int
+    result: Optional[TailoringResponse] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+class MatchedKeyword(BaseModel):
+    keyword: str
+    section: Optional[str] = None
+
+class MatchScore(BaseModel):
+    job_description_id: int
+    score: float
+    keyword_coverage: float
+    similarity: float
+
+class MatchScoreResponse(MatchScore):
+    resume_id: int
+    matched_keywords: List[MatchedKeyword]
+    missing_keywords: List[str]
+
+class MatchRankingResponse(BaseModel):
+    resume_id: int
+    total_job_descriptions: int
+    matches: List[MatchScore]
+
+class JobDescriptionSearchResult(BaseModel):
+    job_description_id: int
+    title: str
+    company: str
+    created_at: datetime
+    matched_skills: List[str]
+    score: float
+
+class JobDescriptionSearchResponse(BaseModel):
+    skills: List[str]
+    mode: str
+    results: List[JobDescriptionSearchResult]
 
 class DownloadResponse(BaseModel):
     success: bool
     message: str
     download_url: Optional[str] = None
     filename: Optional[str] = None
+    page_count: Optional[int] = None
+
+class Page(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
 
 # Error Response Schema
 class ErrorResponse(BaseModel):
@@ -1,14 +1,85 @@
-import openai
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Tuple
 from app.core.config import settings
+from app.core.metrics import LLM_REQUEST_SECONDS, record_llm_usage, timed
+from app.services.keyword_extractor import get_keyword_extractor
+from app.services.llm_cache import llm_cache
+from app.services.openai_client import OpenAIClientManager, openai_manager
+from app.services.prompt_budget import (
+    compact_json, compact_keywords, count_tokens, fit_job_description, output_token_budget, usage_from_response
+)
+from app.utils.json_stream import IncrementalObjectParser
+import asyncio
+import hashlib
 import json
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+
+class IncompleteTailoringError(Exception):
+    """Raised when a tailoring stream breaks off after some sections were already sent"""
+
+
+TAILORING_PROMPT = """You are an expert resume writer. Tailor the following resume for the job description provided.
+
+Job Description:
+{job_description}
+
+Extracted Keywords and Requirements (JSON):
+{keywords}
+
+Current Resume Sections (JSON):
+{sections}
+
+Instructions:
+1. Rewrite each section to better match the job requirements
+2. Use keywords from the job description naturally
+3. Emphasize relevant experience and skills
+4. Remove or minimize irrelevant content
+5. Ensure the resume fits on one page (approximately 500-600 words total)
+6. Maintain professional tone and formatting
+7. Focus on achievements and quantifiable results
+
+Return the tailored resume as a JSON object with these keys:
+{{"contact":"contact information","summary":"tailored professional summary","experience":"tailored work experience","education":"education section","skills":"tailored skills section","projects":"relevant projects (if any)","certifications":"relevant certifications (if any)","word_count":500,"estimated_pages":1.0}}"""
+
+SECTION_PROMPT = """You are an expert resume writer. Rewrite the {section} section of a resume for the job description below.
+
+Job Description:
+{job_description}
+
+Extracted Keywords and Requirements (JSON):
+{keywords}
+
+Current {section} section:
+{content}
+
+Instructions:
+1. {guidance}
+2. Use keywords from the job description naturally, without inventing experience
+3. Keep it to about {words} words so the whole resume fits on one page
+4. Maintain professional tone and formatting
+
+Return only the rewritten section text, with no heading and no commentary."""
+
+# Sections rewritten by their own prompt in "sections" mode: (guidance, target words).
+# Everything else (contact, education, certifications) is passed through unchanged.
+SECTION_GUIDANCE = {
+    "summary": ("Write a 2-3 sentence professional summary aimed at this role", 60),
+    "experience": ("Emphasize relevant experience, achievements and quantifiable results; minimize irrelevant content", 300),
+    "skills": ("List the most relevant skills first and drop skills unrelated to the role", 60),
+    "projects": ("Keep the projects most relevant to the role and highlight the matching technologies", 100),
+}
+WORDS_PER_PAGE = 600
+
 class AIService:
     """Service for AI-powered resume tailoring and keyword extraction"""
     
-    def __init__(self):
-        openai.api_key = settings.openai_api_key
+    KEYWORD_TEMPERATURE = 0.3
+    
+    def __init__(self, client_manager: Optional[OpenAIClientManager] = None):
+        self.client_manager = client_manager or openai_manager
         self.model = settings.gpt_model
         self.max_tokens = settings.max_tokens
         self.temperature = settings.temperature
@@ -16,6 +87,29 @@ class AIService:
     async def extract_keywords_from_jd(self, job_description: str) -> Dict[str, Any]:
         """Extract keywords and requirements from job description"""
         
+        cache_key = llm_cache.make_key(
+            job_description,
+            model=self.model,
+            prompt_version=settings.keyword_prompt_version,
+            temperature=self.KEYWORD_TEMPERATURE
+        )
+        try:
+            cached = await llm_cache.get_async(cache_key)
+        except Exception as e:
+            # A locked or corrupt cache file is just a miss
+            logger.warning("Error reading LLM cache: %s", e)
+            cached = None
+        if cached is not None:
+            return cached
+        
+        # Cheap deterministic pass first; only pay for GPT when it found too little
+        extractor = get_keyword_extractor()
+        local_keywords = extractor.extract(job_description)
+        extractor.observe_skills(local_keywords["technical_skills"] + local_keywords["industry_keywords"])
+        if (settings.local_keyword_first_pass
+                and local_keywords["confidence"] >= settings.local_keyword_confidence_threshold):
+            return local_keywords
+        
         prompt = f"""
         Analyze the following job description and extract:
         1. Key technical skills and technologies
@@ -40,24 +134,32 @@ class AIService:
         """
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.max_tokens,
-                temperature=0.3
-            )
+            with timed(LLM_REQUEST_SECONDS, operation="extract_keywords"):
+                response = await self.client_manager.chat_completion(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=self.max_tokens,
+                    temperature=self.KEYWORD_TEMPERATURE
+                )
+            record_llm_usage("extract_keywords", usage_from_response(response, count_tokens(prompt)))
             
             content = response.choices[0].message.content
             # Extract JSON from response
             json_match = re.search(r'\{.*\}', content, re.DOTALL)
             if json_match:
-                return json.loads(json_match.group())
+                keywords = json.loads(json_match.group())
+                # Only cache real model output; fallbacks should be retried next time
+                try:
+                    await llm_cache.set_async(cache_key, keywords)
+                except Exception as e:
+                    logger.warning("Error writing LLM cache: %s", e)
+                return keywords
             else:
                 # Fallback parsing
                 return self._fallback_keyword_extraction(job_description)
                 
         except Exception as e:
-            print(f"Error in keyword extraction: {e}")
+            logger.warning("Error in keyword extraction: %s", e)
             return self._fallback_keyword_extraction(job_description)
     
     async def tailor_resume(
@@ -65,69 +167,294 @@ class AIService:
         resume_content: str, 
         job_description: str, 
         keywords: Dict[str, Any],
-        preserve_formatting: bool = True
+        preserve_formatting: bool = True,
+        sections: Optional[Dict[str, str]] = None,
+        mode: Optional[str] = None,
+        cached_sections: Optional[Dict[str, str]] = None,
+        raise_on_error: bool = False
     ) -> Dict[str, Any]:
-        """Tailor resume content for specific job description"""
-        
-        # Extract resume sections
-        sections = self._extract_resume_sections(resume_content)
+        """Tailor resume content for specific job description
         
-        prompt = f"""
-        You are an expert resume writer. Tailor the following resume for the job description provided.
-        
-        Job Description:
-        {job_description}
-        
-        Extracted Keywords and Requirements:
-        {json.dumps(keywords, indent=2)}
-        
-        Current Resume Sections:
-        {json.dumps(sections, indent=2)}
+        Model errors fall back to the original content unless raise_on_error is set,
+        for callers such as the job queue that retry instead.
+        """
         
-        Instructions:
-        1. Rewrite each section to better match the job requirements
-        2. Use keywords from the job description naturally
-        3. Emphasize relevant experience and skills
-        4. Remove or minimize irrelevant content
-        5. Ensure the resume fits on one page (approximately 500-600 words total)
-        6. Maintain professional tone and formatting
-        7. Focus on achievements and quantifiable results
+        # Cached sections only apply to sections mode; full mode always rewrites the whole resume
+        if (mode or settings.tailoring_mode) == "sections":
+            return await self.tailor_resume_sections(
+                resume_content, job_description, keywords, sections, cached_sections, raise_on_error
+            )
         
-        Return the tailored resume as a JSON object with the following structure:
-        {{
-            "contact": "contact information",
-            "summary": "tailored professional summary",
-            "experience": "tailored work experience",
-            "education": "education section",
-            "skills": "tailored skills section",
-            "projects": "relevant projects (if any)",
-            "certifications": "relevant certifications (if any)",
-            "word_count": 500,
-            "estimated_pages": 1.0
-        }}
-        """
+        prompt, budget = self._build_tailoring_prompt(resume_content, job_description, keywords, sections)
         
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=self.max_tokens,
-                temperature=0.7
-            )
+            with timed(LLM_REQUEST_SECONDS, operation="tailor_resume"):
+                response = await self.client_manager.chat_completion(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=budget["max_tokens"],
+                    temperature=0.7
+                )
+            token_usage = usage_from_response(response, budget["prompt_tokens"])
+            record_llm_usage("tailor_resume", token_usage)
             
             content = response.choices[0].message.content
             json_match = re.search(r'\{.*\}', content, re.DOTALL)
             
             if json_match:
                 tailored_sections = json.loads(json_match.group())
+                tailored_sections["token_usage"] = token_usage
                 return tailored_sections
             else:
-                return self._fallback_tailoring(resume_content, keywords)
+                raise ValueError("Tailoring response contained no JSON object")
                 
         except Exception as e:
-            print(f"Error in resume tailoring: {e}")
+            if raise_on_error:
+                raise
+            logger.warning("Error in resume tailoring: %s", e)
             return self._fallback_tailoring(resume_content, keywords)
     
+    async def tailor_resume_stream(
+        self,
+        resume_content: str,
+        job_description: str,
+        keywords: Dict[str, Any],
+        preserve_formatting: bool = True,
+        mode: Optional[str] = None,
+        sections: Optional[Dict[str, str]] = None,
+        cached_sections: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream tailored sections as (name, value) pairs as soon as each one is complete"""
+        
+        if (mode or settings.tailoring_mode) == "sections":
+            async for name, value in self.tailor_resume_sections_stream(
+                resume_content, job_description, keywords, sections, cached_sections
+            ):
+                yield name, value
+            return
+        
+        prompt, budget = self._build_tailoring_prompt(resume_content, job_description, keywords, sections)
+        parser = IncrementalObjectParser()
+        emitted = set()
+        completion = []
+        
+        # Covers the whole stream, including time the consumer spends between chunks
+        with timed(LLM_REQUEST_SECONDS, operation="tailor_resume_stream"):
+            try:
+                stream = self.client_manager.chat_completion_stream(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=budget["max_tokens"],
+                    temperature=0.7
+                )
+                
+                async for chunk in stream:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    completion.append(chunk.choices[0].delta.content)
+                    for name, value in parser.feed(chunk.choices[0].delta.content):
+                        emitted.add(name)
+                        yield name, value
+                        
+            except Exception as e:
+                logger.warning("Error in streaming resume tailoring: %s", e)
+        
+        if emitted and not parser.finished:
+            # Sections already went out, so the fallback can't replace them; fail rather than save a partial resume
+            missing = [name for name, content in (sections or {}).items() if content and name not in emitted]
+            raise IncompleteTailoringError(
+                f"Tailoring stream ended early; missing sections: {', '.join(missing) or 'unknown'}"
+            )
+        
+        if not emitted:
+            # Nothing usable came back; send the fallback sections instead
+            for name, value in self._fallback_tailoring(resume_content, keywords).items():
+                yield name, value
+            return
+        
+        # Streams carry no usage block, so count the completion locally
+        token_usage = usage_from_response(None, budget["prompt_tokens"], "".join(completion))
+        record_llm_usage("tailor_resume_stream", token_usage)
+        yield "token_usage", token_usage
+    
+    async def tailor_resume_sections(
+        self,
+        resume_content: str,
+        job_description: str,
+        keywords: Dict[str, Any],
+        sections: Optional[Dict[str, str]] = None,
+        cached_sections: Optional[Dict[str, str]] = None,
+        raise_on_error: bool = False
+    ) -> Dict[str, Any]:
+        """Tailor each section with its own concurrent prompt and merge the results
+        
+        Returns the same shape as tailor_resume, so wall-clock time is roughly that of
+        the slowest section rather than one completion for the whole resume.
+        """
+        
+        tailored_sections = {}
+        async for name, value in self.tailor_resume_sections_stream(
+            resume_content, job_description, keywords, sections, cached_sections, raise_on_error
+        ):
+            tailored_sections[name] = value
+        return tailored_sections
+    
+    async def tailor_resume_sections_stream(
+        self,
+        resume_content: str,
+        job_description: str,
+        keywords: Dict[str, Any],
+        sections: Optional[Dict[str, str]] = None,
+        cached_sections: Optional[Dict[str, str]] = None,
+        raise_on_error: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield unchanged and cached sections immediately, then each rewritten section as its prompt finishes"""
+        
+        if sections is None:
+            sections = self._extract_resume_sections(resume_content)
+        cached_sections = cached_sections or {}
+        
+        for name, content in sections.items():
+            if name not in SECTION_GUIDANCE or not content:
+                yield name, content
+            elif name in cached_sections:
+                yield name, cached_sections[name]
+        
+        async def rewrite(name: str) -> Tuple[str, str, Dict[str, int]]:
+            prompt, budget = self._build_section_prompt(name, sections[name], job_description, keywords)
+            try:
+                with timed(LLM_REQUEST_SECONDS, operation="tailor_section"):
+                    response = await self.client_manager.chat_completion(
+                        model=self.model,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=budget["max_tokens"],
+                        temperature=0.7
+                    )
+                usage = usage_from_response(response, budget["prompt_tokens"])
+                record_llm_usage("tailor_section", usage)
+                content = (response.choices[0].message.content or "").strip()
+                return name, content or sections[name], usage
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                # One failed section shouldn't sink the others; keep its original text
+                logger.warning("Error tailoring %s section: %s", name, e)
+                return name, sections[name], {}
+        
+        pending = [
+            asyncio.ensure_future(rewrite(name))
+            for name in SECTION_GUIDANCE if sections.get(name) and name not in cached_sections
+        ]
+        tailored = {**sections, **cached_sections}
+        token_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        try:
+            for next_section in asyncio.as_completed(pending):
+                name, content, usage = await next_section
+                tailored[name] = content
+                for key in token_usage:
+                    token_usage[key] += usage.get(key, 0)
+                yield name, content
+        finally:
+            # A raised error (or a consumer that stops early) leaves the other prompts running
+            for task in pending:
+                task.cancel()
+        
+        word_count = sum(len(text.split()) for text in tailored.values())
+        yield "word_count", word_count
+        yield "estimated_pages", round(word_count / WORDS_PER_PAGE, 2)
+        yield "token_usage", token_usage
+        yield "reused_sections", [name for name in SECTION_GUIDANCE if name in cached_sections]
+    
+    def section_fingerprints(
+        self,
+        sections: Dict[str, str],
+        keywords: Dict[str, Any],
+        mode: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Fingerprint of everything that determines a rewritten section: its text, the JD keywords, the prompt, model and mode
+        
+        Empty outside sections mode, since only per-section prompts can reuse a cached section.
+        """
+        
+        mode = mode or settings.tailoring_mode
+        if mode != "sections":
+            return {}
+        
+        keyword_hash = hashlib.sha256(
+            json.dumps(compact_keywords(keywords), sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+        return {
+            name: hashlib.sha256(
+                "\0".join([settings.tailoring_prompt_version, self.model, mode, name, keyword_hash, content]).encode()
+            ).hexdigest()
+            for name, content in sections.items()
+            if name in SECTION_GUIDANCE and content
+        }
+    
+    def _build_tailoring_prompt(
+        self,
+        resume_content: str,
+        job_description: str,
+        keywords: Dict[str, Any],
+        sections: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, Dict[str, int]]:
+        """Build the whole-resume tailoring prompt within the model's token budget"""
+        
+        # Extract resume sections unless the caller already has them
+        if sections is None:
+            sections = self._extract_resume_sections(resume_content)
+        
+        max_tokens = output_token_budget(sections, settings.tailoring_min_output_tokens, self.max_tokens)
+        template = TAILORING_PROMPT.format(
+            job_description="{job_description}",
+            keywords=compact_json(compact_keywords(keywords)),
+            sections=compact_json({name: text for name, text in sections.items() if text})
+        )
+        
+        return self._fit_job_description(template, job_description, keywords, max_tokens)
+    
+    def _build_section_prompt(
+        self,
+        section: str,
+        content: str,
+        job_description: str,
+        keywords: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, int]]:
+        """Build the prompt that rewrites a single resume section"""
+        
+        guidance, words = SECTION_GUIDANCE[section]
+        max_tokens = output_token_budget({section: content}, settings.tailoring_section_min_output_tokens, self.max_tokens)
+        template = SECTION_PROMPT.format(
+            section=section,
+            job_description="{job_description}",
+            keywords=compact_json(compact_keywords(keywords)),
+            content=content,
+            guidance=guidance,
+            words=words
+        )
+        
+        return self._fit_job_description(template, job_description, keywords, max_tokens)
+    
+    def _fit_job_description(
+        self,
+        template: str,
+        job_description: str,
+        keywords: Dict[str, Any],
+        max_tokens: int
+    ) -> Tuple[str, Dict[str, int]]:
+        """Fill the template's {job_description} slot with as much of the JD as the budget allows
+        
+        Returns the prompt and a budget report: prompt_tokens, the max_tokens to request
+        and how much of the job description was kept.
+        """
+        
+        # Whatever the template, keywords and resume leave of the context window goes to the JD
+        jd_budget = settings.tailoring_context_tokens - max_tokens - count_tokens(template)
+        compacted_jd, jd_stats = fit_job_description(job_description, keywords, max(jd_budget, 0))
+        prompt = template.replace("{job_description}", compacted_jd, 1)
+        
+        return prompt, {"prompt_tokens": count_tokens(prompt), "max_tokens": max_tokens, **jd_stats}
+    
     def _extract_resume_sections(self, resume_content: str) -> Dict[str, str]:
         """Extract sections from resume content"""
         
@@ -177,42 +504,9 @@ class AIService:
         return sections
     
     def _fallback_keyword_extraction(self, job_description: str) -> Dict[str, Any]:
-        """Fallback keyword extraction using simple text analysis"""
+        """Fallback keyword extraction using the local skill matcher"""
         
-        # Common technical skills
-        tech_skills = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
-            'kubernetes', 'machine learning', 'ai', 'data analysis', 'agile', 'scrum'
-        ]
-        
-        # Common soft skills
-        soft_skills = [
-            'leadership', 'communication', 'teamwork', 'problem solving', 'analytical',
-            'project management', 'customer service', 'sales', 'marketing'
-        ]
-        
-        found_skills = []
-        found_soft_skills = []
-        
-        lower_jd = job_description.lower()
-        
-        for skill in tech_skills:
-            if skill in lower_jd:
-                found_skills.append(skill)
-        
-        for skill in soft_skills:
-            if skill in lower_jd:
-                found_soft_skills.append(skill)
-        
-        return {
-            "technical_skills": found_skills,
-            "required_qualifications": [],
-            "preferred_qualifications": [],
-            "responsibilities": [],
-            "industry_keywords": found_soft_skills,
-            "experience_level": "mid",
-            "job_category": "general"
-        }
+        return get_keyword_extractor().extract(job_description)
     
     def _fallback_tailoring(self, resume_content: str, keywords: Dict[str, Any]) -> Dict[str, Any]:
         """Fallback resume tailoring"""
@@ -228,4 +522,9 @@ class AIService:
             **sections,
             "word_count": len(resume_content.split()),
             "estimated_pages": 1.0
-        } 
\ No newline at end of file
+        } 
+
+
+def get_ai_service() -> AIService:
+    """FastAPI dependency returning an AIService bound to the shared OpenAI client"""
+    return AIService(openai_manager)
\ No newline at end of file
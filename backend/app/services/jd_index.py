@@ -0,0 +1,111 @@
+import math
+import re
+from typing import Any, Dict, List
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import JobDescription, JobDescriptionKeyword
+from app.services.skill_taxonomy import SOFT_SKILLS, TECHNICAL_SKILLS
+
+TECHNICAL_WEIGHT = 1.0
+INDUSTRY_WEIGHT = 0.5
+
+# Lowercased alias -> canonical skill name, so "golang" and "Go" index as the same keyword
+_ALIASES: Dict[str, str] = {}
+for _skills in list(TECHNICAL_SKILLS.values()) + [SOFT_SKILLS]:
+    for _skill, _aliases in _skills.items():
+        _ALIASES[_skill] = _skill
+        for _alias in _aliases:
+            _ALIASES.setdefault(_alias.lower(), _skill)
+
+
+def normalize_keyword(keyword: str) -> str:
+    keyword = re.sub(r"\s+", " ", keyword.strip().lower())
+    return _ALIASES.get(keyword, keyword)
+
+
+def keyword_weights(keywords_data: Dict[str, Any]) -> Dict[str, float]:
+    """Normalized keyword -> weight for one JD's keyword analysis"""
+    weights: Dict[str, float] = {}
+    for field, weight in (("technical_skills", TECHNICAL_WEIGHT), ("industry_keywords", INDUSTRY_WEIGHT)):
+        for keyword in keywords_data.get(field) or []:
+            if isinstance(keyword, str) and keyword.strip():
+                normalized = normalize_keyword(keyword)
+                weights[normalized] = max(weight, weights.get(normalized, 0.0))
+    return weights
+
+
+async def index_job_description(db: AsyncSession, jd_id: int, keywords_data: Dict[str, Any]):
+    """Replace a JD's postings; the caller commits"""
+    await remove_job_description(db, jd_id)
+    db.add_all([
+        JobDescriptionKeyword(keyword=keyword, job_description_id=jd_id, weight=weight)
+        for keyword, weight in keyword_weights(keywords_data).items()
+    ])
+
+
+async def remove_job_description(db: AsyncSession, jd_id: int):
+    await db.execute(delete(JobDescriptionKeyword).where(JobDescriptionKeyword.job_description_id == jd_id))
+
+
+async def search(db: AsyncSession, skills: List[str], match_all: bool, limit: int, offset: int = 0) -> List[Dict[str, Any]]:
+    """Rank JDs by the IDF-weighted sum of matched skill weights (most matched skills first)"""
+
+    keywords = list(dict.fromkeys(normalize_keyword(skill) for skill in skills if skill.strip()))
+    if not keywords:
+        return []
+
+    total = await db.scalar(select(func.count(JobDescription.id))) or 0
+    frequencies = dict((await db.execute(
+        select(JobDescriptionKeyword.keyword, func.count())
+        .where(JobDescriptionKeyword.keyword.in_(keywords))
+        .group_by(JobDescriptionKeyword.keyword)
+    )).all())
+    if match_all and len(frequencies) < len(keywords):
+        return []
+    if not frequencies:
+        return []
+
+    idf = {keyword: math.log((1 + total) / (1 + count)) + 1.0 for keyword, count in frequencies.items()}
+    matched = func.count().label("matched")
+    score = func.sum(
+        JobDescriptionKeyword.weight * case(idf, value=JobDescriptionKeyword.keyword, else_=0.0)
+    ).label("score")
+    postings = (
+        select(JobDescriptionKeyword.job_description_id, matched, score)
+        .where(JobDescriptionKeyword.keyword.in_(list(frequencies)))
+        .group_by(JobDescriptionKeyword.job_description_id)
+    )
+    if match_all:
+        postings = postings.having(func.count() == len(keywords))
+    postings = postings.order_by(matched.desc(), score.desc(), JobDescriptionKeyword.job_description_id.desc())
+    top = (await db.execute(postings.offset(offset).limit(limit))).all()
+    if not top:
+        return []
+
+    ids = [jd_id for jd_id, _, _ in top]
+    jds = {
+        jd.id: jd for jd in await db.execute(
+            select(JobDescription.id, JobDescription.title, JobDescription.company, JobDescription.created_at)
+            .where(JobDescription.id.in_(ids))
+        )
+    }
+    matched_skills: Dict[int, List[str]] = {jd_id: [] for jd_id in ids}
+    for jd_id, keyword in await db.execute(
+        select(JobDescriptionKeyword.job_description_id, JobDescriptionKeyword.keyword)
+        .where(JobDescriptionKeyword.job_description_id.in_(ids), JobDescriptionKeyword.keyword.in_(keywords))
+    ):
+        matched_skills[jd_id].append(keyword)
+
+    return [
+        {
+            "job_description_id": jd_id,
+            "title": jds[jd_id].title,
+            "company": jds[jd_id].company,
+            "created_at": jds[jd_id].created_at,
+            "matched_skills": sorted(matched_skills[jd_id], key=keywords.index),
+            "score": round(float(score_value), 4),
+        }
+        for jd_id, _, score_value in top
+        if jd_id in jds
+    ]
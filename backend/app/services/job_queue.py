@@ -0,0 +1,269 @@
+import asyncio
+import ipaddress
+import json
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+from urllib.parse import urlparse
+import httpx
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal, TailoringJob
+from app.core.metrics import STAGE_SECONDS, timed
+from app.models.schemas import TailoringJobRequest, TailoringRequest
+from app.services.tailoring_service import tailor_and_store
+
+
+class TailoringJobQueue:
+    """SQLite-persisted queue of tailoring jobs drained by a bounded pool of async workers"""
+
+    def __init__(
+        self,
+        workers: int,
+        max_attempts: int,
+        backoff_seconds: float,
+        poll_seconds: float,
+        lease_seconds: float,
+        callback_timeout_seconds: float,
+        callback_allow_private: bool = False
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.callback_timeout_seconds = callback_timeout_seconds
+        self.callback_allow_private = callback_allow_private
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def enqueue(self, db: AsyncSession, request: TailoringJobRequest) -> TailoringJob:
+        """Persist a new job and wake a worker"""
+
+        if request.callback_url:
+            error = await self.check_callback_url(request.callback_url)
+            if error:
+                raise HTTPException(status_code=400, detail=f"Invalid callback_url: {error}")
+
+        job = TailoringJob(
+            id=uuid.uuid4().hex,
+            status="queued",
+            request=TailoringRequest(**request.model_dump(exclude={"callback_url"})).model_dump_json(),
+            callback_url=request.callback_url,
+            max_attempts=self.max_attempts,
+            next_run_at=datetime.utcnow()
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def check_callback_url(self, url: str) -> Optional[str]:
+        """Why the server must not POST to url, or None if it may
+
+        Only http(s) URLs whose host resolves to public addresses are allowed, so a
+        caller can't use the webhook to reach loopback, link-local or private services.
+        """
+
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            return "must be an http or https URL"
+        if self.callback_allow_private:
+            return None
+
+        try:
+            port = parsed.port or (443 if parsed.scheme == "https" else 80)
+            addresses = await asyncio.get_running_loop().getaddrinfo(parsed.hostname, port, type=socket.SOCK_STREAM)
+        except (OSError, ValueError):
+            return "host could not be resolved"
+
+        for address in addresses:
+            ip = ipaddress.ip_address(address[4][0].split("%")[0])
+            if getattr(ip, "ipv4_mapped", None):
+                ip = ip.ipv4_mapped
+            if not ip.is_global or ip.is_multicast:
+                return "host resolves to a non-public address"
+        return None
+
+    async def start(self):
+        """Start the workers; jobs abandoned by a dead process are taken over once their lease expires"""
+
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; their running jobs are retried elsewhere once the leases expire"""
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _claimable(self, now: datetime):
+        """Due queued jobs, plus running jobs whose worker stopped renewing the lease"""
+
+        return or_(
+            and_(TailoringJob.status == "queued", TailoringJob.next_run_at <= now),
+            and_(
+                TailoringJob.status == "running",
+                or_(TailoringJob.lease_expires_at.is_(None), TailoringJob.lease_expires_at < now)
+            )
+        )
+
+    async def _claim(self, db: AsyncSession) -> Optional[TailoringJob]:
+        """Atomically take the oldest claimable job and lease it to this worker"""
+
+        now = datetime.utcnow()
+        candidates = (await db.scalars(
+            select(TailoringJob.id)
+            .where(self._claimable(now))
+            .order_by(TailoringJob.next_run_at, TailoringJob.created_at)
+            .limit(self.workers)
+        )).all()
+        for job_id in candidates:
+            # Re-checking the condition in the UPDATE makes the claim safe across workers and processes
+            claimed = (await db.execute(
+                update(TailoringJob)
+                .where(TailoringJob.id == job_id, self._claimable(now))
+                .values(
+                    status="running",
+                    attempts=TailoringJob.attempts + 1,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    updated_at=now
+                )
+            )).rowcount
+            await db.commit()
+            if claimed:
+                return await db.get(TailoringJob, job_id, populate_existing=True)
+        return None
+
+    async def _worker(self):
+        while True:
+            try:
+                async with SessionLocal() as db:
+                    job = await self._claim(db)
+                    if job is not None:
+                        await self._run(db, job)
+                        continue
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in tailoring job worker: {e}")
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _heartbeat(self, job_id: str):
+        """Keep extending a running job's lease until cancelled"""
+
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                async with SessionLocal() as db:
+                    await db.execute(
+                        update(TailoringJob)
+                        .where(TailoringJob.id == job_id, TailoringJob.status == "running")
+                        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"Error renewing lease for job {job_id}: {e}")
+
+    async def _run(self, db: AsyncSession, job: TailoringJob):
+        if job.attempts > job.max_attempts:
+            # Taken over after its lease lapsed once too often, e.g. a job that keeps killing its worker
+            job.status = "failed"
+            job.error = job.error or "Job was abandoned by its worker too many times"
+            job.lease_expires_at = None
+            await db.commit()
+            await self._notify(job)
+            return
+
+        request = TailoringRequest(**json.loads(job.request))
+        # Its own session, since db is busy with the tailoring itself
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+
+        try:
+            await self._execute(db, job, request)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _execute(self, db: AsyncSession, job: TailoringJob, request: TailoringRequest):
+        try:
+            with timed(STAGE_SECONDS, stage="tailoring_job"):
+                # Raise on model errors so they are retried instead of stored as fallback content
+                response = await tailor_and_store(db, request, raise_on_error=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await db.rollback()
+            # Rollback expires the job; reload it rather than lazy-loading attributes
+            await db.refresh(job)
+            # Missing resumes/JDs won't appear on retry; everything else is assumed transient
+            retryable = not (isinstance(e, HTTPException) and e.status_code < 500)
+            job.error = e.detail if isinstance(e, HTTPException) else str(e)
+            job.lease_expires_at = None
+            if retryable and job.attempts < job.max_attempts:
+                delay = self.backoff_seconds * 2 ** (job.attempts - 1)
+                job.status = "queued"
+                job.next_run_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.5, 1.5))
+                await db.commit()
+                return
+            job.status = "failed"
+            await db.commit()
+            await self._notify(job)
+            return
+
+        job.status = "succeeded"
+        job.lease_expires_at = None
+        job.result = response.model_dump_json()
+        job.error = None
+        await db.commit()
+        await self._notify(job)
+
+    async def _notify(self, job: TailoringJob):
+        """POST the final job state to its callback URL, if one was given"""
+
+        if not job.callback_url:
+            return
+
+        # Checked again here because DNS may have changed since the job was queued
+        error = await self.check_callback_url(job.callback_url)
+        if error:
+            print(f"Error calling job callback {job.callback_url}: {error}")
+            return
+
+        payload = {
+            "job_id": job.id,
+            "status": job.status,
+            "result": json.loads(job.result) if job.result else None,
+            "error": job.error
+        }
+        try:
+            async with httpx.AsyncClient(timeout=self.callback_timeout_seconds) as client:
+                await client.post(job.callback_url, json=payload)
+        except Exception as e:
+            print(f"Error calling job callback {job.callback_url}: {e}")
+
+
+job_queue = TailoringJobQueue(
+    workers=settings.tailoring_job_workers,
+    max_attempts=settings.tailoring_job_max_attempts,
+    backoff_seconds=settings.tailoring_job_backoff_seconds,
+    poll_seconds=settings.tailoring_job_poll_seconds,
+    lease_seconds=settings.tailoring_job_lease_seconds,
+    callback_timeout_seconds=settings.job_callback_timeout_seconds,
+    callback_allow_private=settings.job_callback_allow_private
+)
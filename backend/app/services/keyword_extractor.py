@@ -0,0 +1,181 @@
+import asyncio
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import JobDescription
+from app.services.skill_taxonomy import (
+    CASE_SENSITIVE_FORMS, CATEGORY_JOB_TYPES, SOFT_SKILLS, TECHNICAL_SKILLS
+)
+
+SOFT_SKILL_CATEGORY = "soft_skills"
+
+# Short lines matching these start a block of requirement/responsibility bullets
+HEADER_PATTERNS = [
+    ("preferred_qualifications", re.compile(r"(?i)(preferred|nice[ -]to[ -]have|bonus|plus)")),
+    ("required_qualifications", re.compile(r"(?i)(requirement|qualification|what you.ll need|must[ -]have|you have)")),
+    ("responsibilities", re.compile(r"(?i)(responsibilit|what you.ll do|duties|the role|day[ -]to[ -]day)")),
+]
+BULLET_PREFIX = re.compile(r"^\s*(?:[-*•●▪–]|\d+[.)])\s*")
+YEARS_PATTERN = re.compile(r"(?i)(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?years?")
+SENIOR_PATTERN = re.compile(r"(?i)\b(senior|sr\.?|staff|principal|lead|head of|director)\b")
+ENTRY_PATTERN = re.compile(r"(?i)\b(entry[ -]level|junior|jr\.?|graduate|intern(ship)?)\b")
+
+
+class LocalKeywordExtractor:
+    """Deterministic keyword extraction using a spaCy PhraseMatcher over the skill taxonomy"""
+
+    MAX_ITEMS = 15
+
+    def __init__(self):
+        import spacy
+        from spacy.matcher import PhraseMatcher
+
+        # Only the tokenizer is needed, so no trained pipeline has to be downloaded
+        self.nlp = spacy.blank("en")
+        self.lower_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self.exact_matcher = PhraseMatcher(self.nlp.vocab, attr="ORTH")
+        self.skill_categories: Dict[str, str] = {}
+
+        taxonomy = dict(TECHNICAL_SKILLS)
+        taxonomy[SOFT_SKILL_CATEGORY] = SOFT_SKILLS
+        for category, skills in taxonomy.items():
+            for skill, aliases in skills.items():
+                self.skill_categories[skill] = category
+                phrases = list(aliases)
+                # "go" only matches as "Go", but "node.js" still matches in any case alongside "Node"
+                exact_forms = {form.lower() for form in CASE_SENSITIVE_FORMS.get(skill, [])}
+                if skill.lower() not in exact_forms:
+                    phrases.append(skill)
+                if phrases:
+                    self.lower_matcher.add(skill, [self.nlp.make_doc(phrase) for phrase in phrases])
+
+        for skill, forms in CASE_SENSITIVE_FORMS.items():
+            self.exact_matcher.add(skill, [self.nlp.make_doc(form) for form in forms])
+
+        self.document_frequencies: Counter = Counter()
+        self.corpus_size = 0
+        self._lock = threading.Lock()
+
+    def match_skills(self, text: str) -> List[str]:
+        """Return canonical skill names for every (non-overlapping) mention in text"""
+        from spacy.util import filter_spans
+
+        doc = self.nlp.make_doc(text)
+        spans = []
+        for matcher in (self.lower_matcher, self.exact_matcher):
+            for match_id, start, end in matcher(doc):
+                spans.append(doc[start:end])
+                spans[-1].label_ = self.nlp.vocab.strings[match_id]
+        # Prefer the longest match ("machine learning" over "learning", "c++" over "c")
+        return [span.label_ for span in filter_spans(spans)]
+
+    def fit(self, documents: Iterable[str]):
+        """Add documents to the corpus used for IDF weighting"""
+        for text in documents:
+            self.observe_skills(set(self.match_skills(text)))
+
+    def observe_skills(self, skills: Iterable[str]):
+        with self._lock:
+            self.document_frequencies.update(set(skills))
+            self.corpus_size += 1
+
+    def idf(self, skill: str) -> float:
+        # Smoothed IDF; with an empty corpus every skill weighs 1.0
+        return math.log((1 + self.corpus_size) / (1 + self.document_frequencies[skill])) + 1.0
+
+    def extract(self, job_description: str) -> Dict[str, Any]:
+        """Extract keywords in the same shape as the GPT keyword analysis"""
+
+        counts = Counter(self.match_skills(job_description))
+        scores = {
+            skill: (1.0 + math.log(count)) * self.idf(skill)
+            for skill, count in counts.items()
+        }
+        ranked = sorted(scores, key=lambda skill: (-scores[skill], skill))
+
+        technical_skills = [s for s in ranked if self.skill_categories[s] != SOFT_SKILL_CATEGORY]
+        soft_skills = [s for s in ranked if self.skill_categories[s] == SOFT_SKILL_CATEGORY]
+        blocks = self._extract_blocks(job_description)
+
+        return {
+            "technical_skills": technical_skills,
+            "required_qualifications": blocks["required_qualifications"],
+            "preferred_qualifications": blocks["preferred_qualifications"],
+            "responsibilities": blocks["responsibilities"],
+            "industry_keywords": soft_skills,
+            "experience_level": self._experience_level(job_description),
+            "job_category": self._job_category(technical_skills),
+            "extraction_source": "local",
+            "confidence": self._confidence(technical_skills, blocks)
+        }
+
+    def _extract_blocks(self, text: str) -> Dict[str, List[str]]:
+        blocks = {key: [] for key, _ in HEADER_PATTERNS}
+        current: Optional[str] = None
+
+        for raw_line in text.split("\n"):
+            line = raw_line.strip()
+            if not line:
+                continue
+
+            is_bullet = bool(BULLET_PREFIX.match(line))
+            if not is_bullet and len(line.split()) <= 6:
+                # Short non-bullet lines are headers; unknown headers end the current block
+                current = next((key for key, pattern in HEADER_PATTERNS if pattern.search(line)), None)
+                continue
+
+            if current and len(blocks[current]) < self.MAX_ITEMS:
+                blocks[current].append(BULLET_PREFIX.sub("", line).rstrip(".;"))
+
+        return blocks
+
+    @staticmethod
+    def _experience_level(text: str) -> str:
+        years = [int(match) for match in YEARS_PATTERN.findall(text)]
+        if SENIOR_PATTERN.search(text) or (years and max(years) >= 5):
+            return "senior"
+        if ENTRY_PATTERN.search(text) or (years and max(years) <= 2):
+            return "entry"
+        return "mid"
+
+    def _job_category(self, technical_skills: List[str]) -> str:
+        categories = Counter(CATEGORY_JOB_TYPES[self.skill_categories[s]] for s in technical_skills)
+        return categories.most_common(1)[0][0] if categories else "general"
+
+    @staticmethod
+    def _confidence(technical_skills: List[str], blocks: Dict[str, List[str]]) -> float:
+        """How much a GPT pass is likely to add: high when skills and requirements were both found"""
+        skill_coverage = min(1.0, len(technical_skills) / max(1, settings.local_keyword_min_skills))
+        structure = 1.0 if blocks["required_qualifications"] else 0.6
+        return round(skill_coverage * structure, 3)
+
+
+_extractor: Optional[LocalKeywordExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_keyword_extractor() -> LocalKeywordExtractor:
+    """Process-wide extractor; the matcher is compiled on first use"""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = LocalKeywordExtractor()
+    return _extractor
+
+
+async def fit_keyword_extractor(db: AsyncSession, limit: int):
+    """Build IDF statistics from the most recent stored job descriptions"""
+    contents = (await db.scalars(
+        select(JobDescription.content)
+        .order_by(JobDescription.created_at.desc())
+        .limit(limit)
+    )).all()
+    # Compiling the matcher and matching every document is CPU work; keep it off the event loop
+    await asyncio.to_thread(lambda: get_keyword_extractor().fit(contents))
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class LLMCache:
+    """Two-tier (in-process LRU + SQLite) cache for LLM responses"""
+
+    # Disk hits queue their access-time bump; this many are written in one transaction
+    TOUCH_BATCH = 64
+
+    def __init__(
+        self,
+        path: str,
+        memory_entries: int = 256,
+        max_entries: int = 10000,
+        ttl_seconds: int = 7 * 24 * 3600
+    ):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        # SQLite work holds _lock; the memory tier and counters use _memory_lock, which is
+        # only held briefly and never across disk I/O, so the event loop can take it safely
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._touched: Dict[str, float] = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different pastes share a cache key"""
+        text = unicodedata.normalize("NFKC", text)
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, text: str, model: str, prompt_version: str, temperature: float) -> str:
+        """Build a content-addressed key from the input text and generation parameters"""
+        payload = json.dumps({
+            "text": cls.normalize_text(text),
+            "model": model,
+            "prompt_version": prompt_version,
+            "temperature": temperature
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._memory_lock:
+            self.stats[stat] += amount
+
+    def _remember(self, key: str, value: Any, created_at: float):
+        with self._memory_lock:
+            self._memory[key] = (value, created_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _memory_get(self, key: str, now: float) -> Tuple[bool, Optional[Any]]:
+        """(hit, value) from the in-process tier; never waits on SQLite"""
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return True, value
+                del self._memory[key]
+        return False, None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry"""
+        now = time.time()
+        hit, value = self._memory_get(key, now)
+        if hit:
+            return value
+
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._touched.pop(key, None)
+                conn.commit()
+                self._count("evictions")
+                self._count("misses")
+                return None
+
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH:
+                self._flush_touches(conn)
+                conn.commit()
+
+        value = json.loads(row[0])
+        self._remember(key, value, row[1])
+        self._count("disk_hits")
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under key"""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self._touched.pop(key, None)
+            # Eviction orders by accessed_at, so it needs the queued bumps first
+            self._flush_touches(conn)
+            self._evict(conn, now)
+            conn.commit()
+        self._remember(key, value, now)
+        self._count("writes")
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """get() without blocking the event loop; memory hits skip the thread hop"""
+        # Only the memory lock is taken here; it is never held across SQLite calls
+        hit, value = self._memory_get(key, time.time())
+        if hit:
+            return value
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Any):
+        """set() on a worker thread so the SQLite write doesn't block the event loop"""
+        await asyncio.to_thread(self.set, key, value)
+
+    def _flush_touches(self, conn: sqlite3.Connection):
+        """Write queued access times; call with the disk lock held and commit afterwards"""
+        if self._touched:
+            conn.executemany(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired rows, then the least recently used rows above max_entries"""
+        expired = conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        ).rowcount
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = max(0, count - self.max_entries)
+        if overflow:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+        self._count("evictions", expired + overflow)
+
+    def clear(self):
+        """Remove every cached entry from both tiers"""
+        with self._memory_lock:
+            self._memory.clear()
+        with self._lock:
+            self._touched.clear()
+            conn = self._connection()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the overall hit ratio"""
+        with self._memory_lock:
+            stats = dict(self.stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self._memory)
+        return stats
+
+
+# Process-wide cache shared by every AIService instance
+llm_cache = LLMCache(
+    path=settings.llm_cache_path,
+    memory_entries=settings.llm_cache_memory_entries,
+    max_entries=settings.llm_cache_max_entries,
+    ttl_seconds=settings.llm_cache_ttl_seconds
+)
@@ -0,0 +1,287 @@
+import asyncio
+import json
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import JobDescription
+from app.services.keyword_extractor import get_keyword_extractor
+from app.utils.document_parser import DocumentParser
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or our that the their
+this to we will with you your they them who what which while were was been being over under
+about across all any can may more most must other such than then there these those through
+up very within without would should could also etc per via using use used work working
+""".split())
+
+# How much a keyword counts depending on where the resume mentions it
+SECTION_WEIGHTS = {
+    "experience": 1.0,
+    "projects": 0.8,
+    "skills": 0.6,
+    "summary": 0.5,
+    "certifications": 0.5,
+    "education": 0.3,
+    "contact": 0.0,
+}
+
+LOAD_BATCH_SIZE = 5000
+COVERAGE_WEIGHT = 0.6
+SIMILARITY_WEIGHT = 0.4
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class MatchScorer:
+    """Local ATS-style scoring of resumes against stored job descriptions
+
+    Job descriptions are kept in an in-memory, CSR-style index (one flat array of term ids
+    and one of keyword ids, with per-document offsets) so scoring against every stored JD
+    is a handful of vectorized NumPy operations.
+    """
+
+    def __init__(self):
+        self.term_ids: Dict[str, int] = {}
+        self.keyword_ids: Dict[str, int] = {}
+        self.keyword_forms: List[Tuple[frozenset, Tuple[str, ...]]] = []
+        self.documents: Dict[int, Dict[str, Any]] = {}
+        self.document_frequencies = np.zeros(0, dtype=np.float64)
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        # Scoring runs in worker threads; the index is mutated while applying changes
+        self._lock = threading.Lock()
+
+    # Index maintenance
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.term_ids[term] = len(self.term_ids)
+        return term_id
+
+    def _keyword_id(self, keyword: str) -> int:
+        keyword = keyword.strip().lower()
+        keyword_id = self.keyword_ids.get(keyword)
+        if keyword_id is None:
+            keyword_id = self.keyword_ids[keyword] = len(self.keyword_ids)
+            # Keywords are matched either as taxonomy skills or as a set of tokens
+            self.keyword_forms.append((frozenset(get_keyword_extractor().match_skills(keyword)), tuple(tokenize(keyword))))
+        return keyword_id
+
+    @staticmethod
+    def job_keywords(extracted_keywords: Optional[str]) -> List[str]:
+        """Skill-like keywords from a JD's stored keyword analysis"""
+        if not extracted_keywords:
+            return []
+        try:
+            data = json.loads(extracted_keywords)
+        except ValueError:
+            return []
+        keywords = data.get("technical_skills", []) + data.get("industry_keywords", [])
+        return list(dict.fromkeys(k for k in keywords if isinstance(k, str) and k.strip()))
+
+    def add_document(self, jd_id: int, content: str, extracted_keywords: Optional[str]):
+        counts = Counter(self._term_id(term) for term in tokenize(content))
+        terms = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        keywords = [self._keyword_id(keyword) for keyword in self.job_keywords(extracted_keywords)]
+
+        if len(self.term_ids) > len(self.document_frequencies):
+            grown = np.zeros(max(len(self.term_ids), 2 * len(self.document_frequencies)))
+            grown[:len(self.document_frequencies)] = self.document_frequencies
+            self.document_frequencies = grown
+        self.document_frequencies[terms] += 1
+
+        self.documents[jd_id] = {
+            "terms": terms,
+            "length": float(sum(counts.values())),
+            "keywords": np.array(sorted(set(keywords)), dtype=np.int64),
+        }
+        self._arrays = None
+
+    def remove_document(self, jd_id: int):
+        document = self.documents.pop(jd_id, None)
+        if document is not None:
+            self.document_frequencies[document["terms"]] -= 1
+            self._arrays = None
+
+    async def _fetch_changes(self, db: AsyncSession) -> Tuple[set, list]:
+        """Current JD ids plus the rows this index has not loaded yet"""
+        stored_ids = set(await db.scalars(select(JobDescription.id)))
+        with self._lock:
+            missing = sorted(stored_ids - set(self.documents))
+
+        rows = []
+        # Batched to stay under the database's bound-parameter limit on a cold start
+        for start in range(0, len(missing), LOAD_BATCH_SIZE):
+            rows.extend(await db.execute(
+                select(JobDescription.id, JobDescription.content, JobDescription.extracted_keywords)
+                .where(JobDescription.id.in_(missing[start:start + LOAD_BATCH_SIZE]))
+            ))
+        return stored_ids, rows
+
+    def _apply_changes(self, stored_ids: set, rows: list):
+        """Bring the index in line with the job_descriptions table; called with the lock held"""
+        for jd_id in set(self.documents) - stored_ids:
+            self.remove_document(jd_id)
+        for jd_id, content, extracted_keywords in rows:
+            if jd_id not in self.documents:
+                self.add_document(jd_id, content, extracted_keywords)
+
+    def _build_arrays(self) -> Dict[str, np.ndarray]:
+        if self._arrays is None:
+            ids = sorted(self.documents)
+            docs = [self.documents[jd_id] for jd_id in ids]
+            self._arrays = {
+                "ids": np.array(ids, dtype=np.int64),
+                "terms": np.concatenate([d["terms"] for d in docs]) if docs else np.zeros(0, dtype=np.int64),
+                "term_offsets": np.cumsum([0] + [len(d["terms"]) for d in docs]),
+                "keywords": np.concatenate([d["keywords"] for d in docs]) if docs else np.zeros(0, dtype=np.int64),
+                "keyword_offsets": np.cumsum([0] + [len(d["keywords"]) for d in docs]),
+                "lengths": np.array([d["length"] for d in docs], dtype=np.float64),
+            }
+        return self._arrays
+
+    # Scoring
+
+    def _resume_profile(self, resume_text: str) -> Dict[str, Any]:
+        sections = DocumentParser.extract_resume_sections(resume_text)
+        extractor = get_keyword_extractor()
+        section_skills = {name: set(extractor.match_skills(text)) for name, text in sections.items() if text}
+        section_tokens = {name: set(tokenize(text)) for name, text in sections.items() if text}
+
+        term_counts = np.zeros(len(self.term_ids))
+        resume_terms = tokenize(resume_text)
+        for term, count in Counter(resume_terms).items():
+            term_id = self.term_ids.get(term)
+            if term_id is not None:
+                term_counts[term_id] = count
+
+        return {
+            "section_skills": section_skills,
+            "section_tokens": section_tokens,
+            "term_counts": term_counts,
+            "length": float(len(resume_terms)),
+        }
+
+    def _keyword_weights(self, profile: Dict[str, Any]) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Best section weight (and which section) at which the resume mentions each known keyword"""
+        weights = np.zeros(len(self.keyword_forms))
+        sections: List[Optional[str]] = [None] * len(self.keyword_forms)
+        for keyword_id, (skills, tokens) in enumerate(self.keyword_forms):
+            for name, weight in SECTION_WEIGHTS.items():
+                if weight <= weights[keyword_id]:
+                    continue
+                if (skills and skills <= profile["section_skills"].get(name, set())) or \
+                        (not skills and tokens and set(tokens) <= profile["section_tokens"].get(name, set())):
+                    weights[keyword_id] = weight
+                    sections[keyword_id] = name
+        return weights, sections
+
+    def _score_arrays(self, profile: Dict[str, Any], keyword_weights: np.ndarray) -> Dict[str, np.ndarray]:
+        arrays = self._build_arrays()
+        n_docs = len(arrays["ids"])
+        if n_docs == 0:
+            return {"score": np.zeros(0), "coverage": np.zeros(0), "similarity": np.zeros(0)}
+
+        # BM25 with each JD as the query and the resume as the document, normalized by the
+        # best score the resume could get, so similarity is comparable across JDs (0..1)
+        df = self.document_frequencies[:len(self.term_ids)]
+        idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        avg_length = arrays["lengths"].mean() or 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * profile["length"] / avg_length)
+        tf = profile["term_counts"]
+        saturation = np.zeros_like(tf)
+        nonzero = tf > 0
+        saturation[nonzero] = tf[nonzero] * (BM25_K1 + 1) / (tf[nonzero] + norm)
+
+        term_idf = idf[arrays["terms"]]
+        gained = self._segment_sum(term_idf * saturation[arrays["terms"]], arrays["term_offsets"])
+        possible = self._segment_sum(term_idf * (BM25_K1 + 1), arrays["term_offsets"])
+        similarity = np.divide(gained, possible, out=np.zeros(n_docs), where=possible > 0)
+
+        keyword_counts = np.diff(arrays["keyword_offsets"])
+        keyword_sum = self._segment_sum(keyword_weights[arrays["keywords"]], arrays["keyword_offsets"])
+        coverage = np.divide(keyword_sum, keyword_counts, out=np.zeros(n_docs), where=keyword_counts > 0)
+
+        # Without extracted keywords, fall back to similarity alone
+        score = np.where(
+            keyword_counts > 0,
+            COVERAGE_WEIGHT * coverage + SIMILARITY_WEIGHT * similarity,
+            similarity
+        ) * 100.0
+        return {"score": score, "coverage": coverage, "similarity": similarity}
+
+    @staticmethod
+    def _segment_sum(values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Sum values within each [offsets[i], offsets[i+1]) segment, allowing empty segments"""
+        totals = np.concatenate([[0.0], np.cumsum(values)])
+        return totals[offsets[1:]] - totals[offsets[:-1]]
+
+    async def score(self, db: AsyncSession, resume_text: str, jd_id: int) -> Optional[Dict[str, Any]]:
+        """Score one resume against one job description, with a keyword breakdown"""
+        changes = await self._fetch_changes(db)
+        return await asyncio.to_thread(self._score, changes, resume_text, jd_id)
+
+    def _score(self, changes: Tuple[set, list], resume_text: str, jd_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._apply_changes(*changes)
+            if jd_id not in self.documents:
+                return None
+
+            profile = self._resume_profile(resume_text)
+            keyword_weights, keyword_sections = self._keyword_weights(profile)
+            results = self._score_arrays(profile, keyword_weights)
+            index = int(np.searchsorted(self._build_arrays()["ids"], jd_id))
+
+            matched, missing = [], []
+            keyword_names = {keyword_id: keyword for keyword, keyword_id in self.keyword_ids.items()}
+            for keyword_id in self.documents[jd_id]["keywords"]:
+                if keyword_weights[keyword_id] > 0:
+                    matched.append({"keyword": keyword_names[keyword_id], "section": keyword_sections[keyword_id]})
+                else:
+                    missing.append(keyword_names[keyword_id])
+
+        return {
+            "job_description_id": jd_id,
+            "score": round(float(results["score"][index]), 2),
+            "keyword_coverage": round(float(results["coverage"][index]), 4),
+            "similarity": round(float(results["similarity"][index]), 4),
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+        }
+
+    async def rank(self, db: AsyncSession, resume_text: str, limit: int) -> List[Dict[str, Any]]:
+        """Score one resume against every stored job description, best first"""
+        changes = await self._fetch_changes(db)
+        return await asyncio.to_thread(self._rank, changes, resume_text, limit)
+
+    def _rank(self, changes: Tuple[set, list], resume_text: str, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._apply_changes(*changes)
+            profile = self._resume_profile(resume_text)
+            keyword_weights, _ = self._keyword_weights(profile)
+            results = self._score_arrays(profile, keyword_weights)
+            ids = self._build_arrays()["ids"]
+
+        top = np.argsort(-results["score"], kind="stable")[:limit]
+        return [
+            {
+                "job_description_id": int(ids[i]),
+                "score": round(float(results["score"][i]), 2),
+                "keyword_coverage": round(float(results["coverage"][i]), 4),
+                "similarity": round(float(results["similarity"][i]), 4),
+            }
+            for i in top
+        ]
+
+
+match_scorer = MatchScorer()
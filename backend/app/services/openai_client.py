@@ -0,0 +1,184 @@
+import asyncio
+import random
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+import openai
+
+from app.core.config import settings
+from app.services.prompt_budget import count_tokens
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at capacity per minute"""
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = float(capacity_per_minute)
+        self.rate = capacity_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float):
+        """Wait until amount tokens are available and take them"""
+        if self.capacity <= 0:
+            return
+        # A single request larger than the whole budget would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, delta: float):
+        """Correct an earlier estimate once the real usage is known (may go negative)"""
+        if self.capacity <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class OpenAIClientManager:
+    """Process-wide OpenAI client with connection pooling, rate limiting and retries"""
+
+    RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+    def __init__(
+        self,
+        api_key: str,
+        max_connections: int,
+        max_concurrency: int,
+        rpm_limit: int,
+        tpm_limit: int,
+        max_retries: int,
+        retry_base_seconds: float,
+        timeout_seconds: float,
+        base_url: Optional[str] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.timeout_seconds = timeout_seconds
+        self.requests_bucket = TokenBucket(rpm_limit)
+        self.tokens_bucket = TokenBucket(tpm_limit)
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[openai.AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> openai.AsyncOpenAI:
+        if self._client is None:
+            self.start()
+        return self._client
+
+    def start(self):
+        """Create the pooled HTTP client; called at app startup (or lazily on first use)"""
+        if self._client is not None:
+            return
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=self.timeout_seconds
+        )
+        # Retries are handled here so they also go through the rate limiter
+        self._client = openai.AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=self._http_client,
+            max_retries=0
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._client = None
+        self._semaphore = None
+
+    @staticmethod
+    def estimate_tokens(request: Dict[str, Any]) -> int:
+        """Local token count of the prompt plus the completion budget"""
+        prompt_tokens = sum(count_tokens(message.get("content") or "") for message in request.get("messages", []))
+        return prompt_tokens + request.get("max_tokens", 0)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter keeps concurrent callers from retrying in lockstep
+        return random.uniform(0, self.retry_base_seconds * 2 ** attempt)
+
+    async def _throttle(self, request: Dict[str, Any]) -> int:
+        estimate = self.estimate_tokens(request)
+        await self.requests_bucket.acquire(1)
+        await self.tokens_bucket.acquire(estimate)
+        return estimate
+
+    async def chat_completion(self, **request: Any) -> Any:
+        """Create a chat completion, retrying 429/5xx/connection errors with jittered backoff"""
+
+        client = self.client
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                estimate = await self._throttle(request)
+                try:
+                    response = await client.chat.completions.create(**request)
+                except self.RETRYABLE_ERRORS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    await asyncio.sleep(self._retry_delay(attempt, e))
+                    continue
+
+                if getattr(response, "usage", None):
+                    self.tokens_bucket.adjust(response.usage.total_tokens - estimate)
+                return response
+
+    async def chat_completion_stream(self, **request: Any) -> AsyncIterator[Any]:
+        """Stream chat completion chunks; retries only happen before the first chunk arrives"""
+
+        client = self.client
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self._throttle(request)
+                try:
+                    stream = await client.chat.completions.create(stream=True, **request)
+                except self.RETRYABLE_ERRORS as e:
+                    if attempt >= self.max_retries:
+                        raise
+                    await asyncio.sleep(self._retry_delay(attempt, e))
+                    continue
+
+                async for chunk in stream:
+                    yield chunk
+                return
+
+
+# Shared by every request in this process; started and closed with the app
+openai_manager = OpenAIClientManager(
+    api_key=settings.openai_api_key,
+    max_connections=settings.openai_max_connections,
+    max_concurrency=settings.openai_max_concurrency,
+    rpm_limit=settings.openai_rpm_limit,
+    tpm_limit=settings.openai_tpm_limit,
+    max_retries=settings.openai_max_retries,
+    retry_base_seconds=settings.openai_retry_base_seconds,
+    timeout_seconds=settings.openai_timeout_seconds,
+    base_url=settings.openai_base_url
+)
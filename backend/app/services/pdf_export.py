@@ -0,0 +1,113 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import PDFArtifact, Resume, TailoredResume
+from app.services.pdf_store import pdf_store
+from app.utils.pdf_generator import PDFGenerator, render_pool
+from app.utils.zip_stream import ZipStream
+
+
+def build_resume_data(
+    pdf_generator: PDFGenerator,
+    tailored_resume: TailoredResume,
+    original_resume: Optional[Resume]
+) -> Dict[str, Any]:
+    """Template data for a tailored resume's PDF"""
+    
+    # Extract sections from tailored content
+    return pdf_generator.create_resume_data({
+        "contact": original_resume.parsed_content.split('\n')[0] if original_resume and original_resume.parsed_content else "",
+        "summary": "",
+        "experience": tailored_resume.tailored_content,
+        "education": "",
+        "skills": "",
+        "projects": "",
+        "certifications": ""
+    })
+
+
+async def attach_pdf(db: AsyncSession, tailored_resume: TailoredResume, artifact: PDFArtifact):
+    """Point a tailored resume at its PDF; the caller commits"""
+    
+    await pdf_store.attach(db, tailored_resume, artifact.filename)
+    # The measured layout replaces the model's page estimate
+    if artifact.page_count is not None:
+        tailored_resume.is_one_page = artifact.page_count <= 1
+
+
+def archive_name(tailored_resume: TailoredResume) -> str:
+    return f"tailored_resume_{tailored_resume.id}.pdf"
+
+
+async def stream_bulk_pdfs(
+    db: AsyncSession,
+    tailored_resumes: List[TailoredResume],
+    pdf_generator: Optional[PDFGenerator] = None
+) -> AsyncIterator[bytes]:
+    """Yield a ZIP of tailored resume PDFs as it is built
+    
+    Stored PDFs are streamed straight away while missing ones render in parallel
+    on the render pool; each rendered file is added as soon as it finishes. PDFs
+    that fail to render are listed in errors.txt instead.
+    """
+    
+    pdf_generator = pdf_generator or PDFGenerator()
+    archive = ZipStream()
+    errors = []
+    
+    ready = [
+        tailored_resume for tailored_resume in tailored_resumes
+        if tailored_resume.pdf_path and os.path.exists(pdf_store.path_for(tailored_resume.pdf_path))
+    ]
+    missing = [tailored_resume for tailored_resume in tailored_resumes if tailored_resume not in ready]
+    resumes = {}
+    if missing:
+        resumes = {
+            resume.id: resume for resume in
+            await db.scalars(select(Resume).where(Resume.id.in_({tr.resume_id for tr in missing})))
+        }
+    
+    # Enough concurrent renders to keep every worker busy without overflowing the pool's queue
+    semaphore = asyncio.Semaphore(render_pool.max_workers)
+    
+    async def render_one(tailored_resume: TailoredResume):
+        resume_data = build_resume_data(pdf_generator, tailored_resume, resumes.get(tailored_resume.resume_id))
+        async with semaphore:
+            try:
+                content_hash, fit = await pdf_store.render(resume_data, pdf_generator=pdf_generator)
+                return tailored_resume, content_hash, fit, None
+            except Exception as e:
+                return tailored_resume, None, None, e
+    
+    # Start rendering before streaming the stored files so the two overlap
+    renders = [asyncio.create_task(render_one(tailored_resume)) for tailored_resume in missing]
+    try:
+        for tailored_resume in ready:
+            for chunk in archive.add_file(archive_name(tailored_resume), pdf_store.path_for(tailored_resume.pdf_path)):
+                yield chunk
+        
+        for next_render in asyncio.as_completed(renders):
+            tailored_resume, content_hash, fit, error = await next_render
+            if error is not None:
+                print(f"Error rendering PDF for tailored resume {tailored_resume.id}: {error}")
+                errors.append(f"{archive_name(tailored_resume)}: {str(error) or type(error).__name__}")
+                continue
+            
+            # Database writes stay on this task; the session can't be shared by the renders
+            artifact = await pdf_store.record(db, content_hash, fit=fit)
+            await attach_pdf(db, tailored_resume, artifact)
+            for chunk in archive.add_file(archive_name(tailored_resume), pdf_store.path_for(artifact.filename)):
+                yield chunk
+        
+        await db.commit()
+    finally:
+        # The client may disconnect mid-download
+        for render in renders:
+            render.cancel()
+    
+    if errors:
+        yield archive.add_bytes("errors.txt", ("\n".join(errors) + "\n").encode())
+    yield archive.close()
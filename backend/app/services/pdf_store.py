@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import PDFArtifact, SessionLocal, TailoredResume
+from app.core.metrics import record_cache_lookup
+from app.utils.pdf_generator import PDFGenerator
+from app.utils.template_registry import template_registry
+
+
+class PDFStore:
+    """Content-addressed store for rendered resume PDFs"""
+
+    def __init__(self, output_dir: str, grace_seconds: int):
+        self.output_dir = output_dir
+        self.grace_seconds = grace_seconds
+        self._render_locks: Dict[str, asyncio.Lock] = {}
+        self._lock_users: Dict[str, int] = {}
+
+    @staticmethod
+    def content_hash(resume_data: Dict[str, Any], template_name: str) -> str:
+        """Hash of the rendered data, template name and template/CSS version"""
+        payload = json.dumps({
+            "data": resume_data,
+            "template": template_name,
+            "version": template_registry.get_version(template_name)
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def filename_for(content_hash: str) -> str:
+        return f"resume_{content_hash[:16]}.pdf"
+
+    async def get_or_render(
+        self,
+        db: AsyncSession,
+        resume_data: Dict[str, Any],
+        template_name: str = "professional",
+        pdf_generator: Optional[PDFGenerator] = None
+    ) -> PDFArtifact:
+        """Return the stored PDF for this content, rendering it only if it does not exist yet"""
+
+        content_hash, fit = await self.render(resume_data, template_name, pdf_generator)
+        return await self.record(db, content_hash, template_name, fit)
+
+    async def render(
+        self,
+        resume_data: Dict[str, Any],
+        template_name: str = "professional",
+        pdf_generator: Optional[PDFGenerator] = None
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Render the PDF file for this content if missing; no database access, so safe to run concurrently
+
+        Returns the content hash and the page fitter's stats, or None when the file already existed.
+        """
+
+        content_hash = self.content_hash(resume_data, template_name)
+        filename = self.filename_for(content_hash)
+        output_path = os.path.join(self.output_dir, filename)
+        fit = None
+
+        # Single-flight: concurrent identical requests wait for one render
+        lock = self._render_locks.setdefault(content_hash, asyncio.Lock())
+        self._lock_users[content_hash] = self._lock_users.get(content_hash, 0) + 1
+        try:
+            async with lock:
+                record_cache_lookup("pdf", os.path.exists(output_path))
+                if not os.path.exists(output_path):
+                    pdf_generator = pdf_generator or PDFGenerator()
+                    temp_filename = f"{filename}.{uuid.uuid4().hex[:8]}.tmp"
+                    _, fit = await pdf_generator.generate_pdf_async(resume_data, template_name, filename=temp_filename)
+                    # Atomic rename so downloads never see a half-written file
+                    os.replace(os.path.join(self.output_dir, temp_filename), output_path)
+        finally:
+            self._lock_users[content_hash] -= 1
+            if not self._lock_users[content_hash]:
+                del self._lock_users[content_hash]
+                del self._render_locks[content_hash]
+
+        return content_hash, fit
+
+    async def record(
+        self,
+        db: AsyncSession,
+        content_hash: str,
+        template_name: str = "professional",
+        fit: Optional[Dict[str, Any]] = None
+    ) -> PDFArtifact:
+        """Create or touch the artifact row for a rendered file; the caller commits"""
+
+        filename = self.filename_for(content_hash)
+        artifact = await db.get(PDFArtifact, filename)
+        if artifact is None:
+            artifact = PDFArtifact(
+                filename=filename,
+                content_hash=content_hash,
+                template_name=template_name,
+                ref_count=0
+            )
+            db.add(artifact)
+        if fit is not None:
+            artifact.page_count = fit["page_count"]
+        artifact.last_used_at = datetime.utcnow()
+        await db.flush()
+
+        return artifact
+
+    def path_for(self, filename: str) -> str:
+        return os.path.join(self.output_dir, filename)
+
+    async def attach(self, db: AsyncSession, tailored_resume: TailoredResume, filename: str):
+        """Point a tailored resume at a stored PDF, moving its reference from any previous file"""
+
+        previous = tailored_resume.pdf_path
+        if previous == filename:
+            return
+
+        if previous:
+            old_artifact = await db.get(PDFArtifact, previous)
+            if old_artifact and old_artifact.ref_count > 0:
+                old_artifact.ref_count -= 1
+
+        artifact = await db.get(PDFArtifact, filename)
+        if artifact:
+            artifact.ref_count += 1
+
+        tailored_resume.pdf_path = filename
+
+    async def sweep(self, db: AsyncSession) -> int:
+        """Delete unreferenced PDFs older than the grace period; returns the number removed"""
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.grace_seconds)
+        removed = 0
+
+        stale = (await db.scalars(select(PDFArtifact).where(
+            PDFArtifact.ref_count <= 0,
+            PDFArtifact.last_used_at < cutoff
+        ))).all()
+        for artifact in stale:
+            path = os.path.join(self.output_dir, artifact.filename)
+            if os.path.exists(path):
+                os.remove(path)
+            await db.delete(artifact)
+            removed += 1
+        await db.commit()
+
+        # Files nobody tracks: legacy uuid PDFs no row points to and leftover temp files
+        tracked = set(await db.scalars(select(PDFArtifact.filename)))
+        referenced = set(await db.scalars(
+            select(TailoredResume.pdf_path).where(TailoredResume.pdf_path.isnot(None))
+        ))
+        cutoff_ts = time.time() - self.grace_seconds
+        for name in os.listdir(self.output_dir):
+            if name in tracked or name in referenced:
+                continue
+            if not (name.endswith(".pdf") or name.endswith(".tmp")):
+                continue
+            path = os.path.join(self.output_dir, name)
+            if os.path.getmtime(path) < cutoff_ts:
+                os.remove(path)
+                removed += 1
+
+        return removed
+
+    async def run_sweeper(self, interval_seconds: int):
+        """Background task that periodically sweeps unreferenced PDFs"""
+
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with SessionLocal() as db:
+                    await self.sweep(db)
+            except Exception as e:
+                print(f"Error sweeping PDF store: {e}")
+
+
+pdf_store = PDFStore(
+    output_dir=settings.pdf_output_dir,
+    grace_seconds=settings.pdf_sweep_grace_seconds
+)
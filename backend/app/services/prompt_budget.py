@@ -0,0 +1,201 @@
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.match_scorer import tokenize
+
+# Mirrors the cl100k pre-tokenizer split: contractions, letter runs, up to 3 digits,
+# punctuation runs and whitespace, each optionally led by one space
+PRETOKENIZE_PATTERN = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)| ?[^\W\d_]+| ?\d{1,3}| ?[^\s\w]+|\s+", re.IGNORECASE
+)
+
+# Recruiting boilerplate that never helps tailoring: EEO/legal notices, benefits, how to apply
+BOILERPLATE_PATTERNS = [
+    re.compile(r"(?i)equal (employment )?opportunity|without regard to|protected (veteran|class|characteristic)"),
+    re.compile(r"(?i)reasonable accommodation|e-?verify|background check|drug[- ]free"),
+    re.compile(r"(?i)\b(401\(?k\)?|pto|paid time off|health,? dental|dental,? (and )?vision|parental leave)\b"),
+    re.compile(r"(?i)^(how to apply|to apply|apply (now|today)|click apply)\b"),
+    re.compile(r"(?i)(salary|pay|compensation) range|base pay"),
+]
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])|\n+")
+HEADER_LINE = re.compile(r"^[^.!?]{1,60}:?$")
+
+# Keys in keyword analyses that only matter to this service, not to the model
+KEYWORD_METADATA = ("extraction_source", "confidence")
+
+
+CL100K_BLOB_URL = "https://openaipublic.blob.core.windows.net/encodings/cl100k_base.tiktoken"
+
+# Set by load_token_encoding() at startup; until then (or without tiktoken) counts are approximate
+_encoding = None
+
+
+def _tiktoken_cache_path() -> str:
+    """Where tiktoken keeps the downloaded cl100k BPE file (same layout as tiktoken.load)"""
+    cache_dir = (
+        os.environ.get("TIKTOKEN_CACHE_DIR")
+        or os.environ.get("DATA_GYM_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    )
+    return os.path.join(cache_dir, hashlib.sha1(CL100K_BLOB_URL.encode()).hexdigest())
+
+
+def load_token_encoding(allow_download: bool = False) -> bool:
+    """Load tiktoken's cl100k encoding for exact counts; blocking, so run it off the event loop
+
+    Without allow_download it is only loaded from tiktoken's local cache, so an offline
+    server never touches the network. Any failure keeps the approximate counter.
+    """
+    global _encoding
+    try:
+        import tiktoken
+    except ImportError:
+        return False
+
+    if not allow_download and not os.path.exists(_tiktoken_cache_path()):
+        print("tiktoken's cl100k file isn't cached locally; using approximate token counts")
+        return False
+    try:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"Error loading tiktoken encoding, using approximate token counts: {e}")
+        return False
+    return True
+
+
+def _approximate_tokens(text: str) -> int:
+    tokens = 0
+    for piece in PRETOKENIZE_PATTERN.findall(text):
+        stripped = piece.strip()
+        if not stripped:
+            tokens += 1
+        elif stripped[0].isalpha():
+            # Common words are a single BPE token; longer ones split roughly every 4 characters
+            tokens += 1 if len(stripped) <= 6 else math.ceil(len(stripped) / 4)
+        elif stripped[0].isdigit():
+            tokens += 1
+        else:
+            tokens += math.ceil(len(stripped) / 2)
+    return tokens
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens offline; exact with tiktoken, a slight overestimate without it"""
+    if not text:
+        return 0
+    encoding = _encoding
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _approximate_tokens(text)
+
+
+def compact_json(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_keywords(keywords: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop empty fields and service-only metadata from a keyword analysis"""
+    return {
+        key: value for key, value in keywords.items()
+        if key not in KEYWORD_METADATA and value not in (None, "", [], {})
+    }
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence and sentence.strip()]
+
+
+def dedupe_job_description(job_description: str) -> List[str]:
+    """Sentences of a JD with repeats and recruiting boilerplate removed, in original order"""
+    seen = set()
+    sentences = []
+    for sentence in split_sentences(job_description):
+        normalized = " ".join(tokenize(sentence))
+        if not normalized or normalized in seen:
+            continue
+        if any(pattern.search(sentence) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        seen.add(normalized)
+        sentences.append(sentence)
+    return sentences
+
+
+def _sentence_scores(sentences: List[str], keywords: Dict[str, Any]) -> List[float]:
+    """Relevance of each JD sentence: keyword hits per token, plus a bonus for short headers"""
+    terms = set()
+    for field in ("technical_skills", "industry_keywords", "required_qualifications"):
+        for keyword in keywords.get(field) or []:
+            if isinstance(keyword, str):
+                terms.update(tokenize(keyword))
+
+    scores = []
+    for sentence in sentences:
+        words = tokenize(sentence)
+        hits = sum(1 for word in words if word in terms)
+        score = hits / math.sqrt(len(words)) if words else 0.0
+        if HEADER_LINE.match(sentence):
+            score += 0.5
+        scores.append(score)
+    return scores
+
+
+def fit_job_description(
+    job_description: str,
+    keywords: Dict[str, Any],
+    token_budget: int
+) -> Tuple[str, Dict[str, int]]:
+    """Compact a JD to fit token_budget, dropping its lowest-scoring sentences first"""
+
+    sentences = dedupe_job_description(job_description)
+    token_counts = [count_tokens(sentence) + 1 for sentence in sentences]
+    stats = {
+        "job_description_tokens": count_tokens(job_description),
+        "sentences": len(split_sentences(job_description)),
+        "sentences_kept": len(sentences),
+    }
+
+    total = sum(token_counts)
+    if total > token_budget:
+        scores = _sentence_scores(sentences, keywords)
+        keep = set(range(len(sentences)))
+        # Lowest score first; among equals, drop later sentences first
+        for index in sorted(range(len(sentences)), key=lambda i: (scores[i], -i)):
+            if total <= token_budget:
+                break
+            keep.discard(index)
+            total -= token_counts[index]
+        sentences = [sentence for index, sentence in enumerate(sentences) if index in keep]
+        stats["sentences_kept"] = len(sentences)
+
+    compacted = "\n".join(sentences)
+    stats["job_description_tokens_kept"] = count_tokens(compacted)
+    return compacted, stats
+
+
+def output_token_budget(sections: Dict[str, str], floor: int, ceiling: int) -> int:
+    """Completion budget sized to the resume being rewritten rather than a fixed maximum"""
+    resume_tokens = count_tokens(compact_json(sections))
+    # The rewrite is about as long as the input, plus JSON keys and the page estimate
+    return max(floor, min(ceiling, int(resume_tokens * 1.3) + 200))
+
+
+def usage_from_response(response: Any, prompt_tokens: int, completion_text: Optional[str] = None) -> Dict[str, int]:
+    """Token usage reported by the API, falling back to local counts (e.g. for streams)"""
+    usage = getattr(response, "usage", None) if response is not None else None
+    if usage is not None:
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+        }
+    completion_tokens = count_tokens(completion_text or "")
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
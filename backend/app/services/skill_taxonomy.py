@@ -0,0 +1,136 @@
+# Skill taxonomy used by the local keyword extractor.
+# Keys are categories; each maps canonical skill names to the aliases that should match them.
+
+TECHNICAL_SKILLS = {
+    "programming_languages": {
+        "python": [], "java": [], "javascript": ["js", "ecmascript"], "typescript": [],
+        "c": [], "c++": ["cpp"], "c#": ["csharp", "c sharp"], "go": ["golang"], "rust": [],
+        "ruby": [], "php": [], "swift": [], "kotlin": [], "scala": [], "r": [], "matlab": [],
+        "perl": [], "bash": ["shell scripting"], "powershell": [], "haskell": [], "elixir": [],
+        "erlang": [], "clojure": [], "dart": [], "lua": [], "objective-c": [], "sql": [],
+        "html": ["html5"], "css": ["css3"], "sass": ["scss"], "graphql": [], "solidity": [],
+        "fortran": [], "cobol": [], "vba": [], "julia": [],
+    },
+    "frontend": {
+        "react": ["react.js", "reactjs"], "angular": ["angularjs"], "vue": ["vue.js", "vuejs"],
+        "svelte": [], "next.js": ["nextjs"], "nuxt": [], "redux": [], "jquery": [],
+        "tailwind css": ["tailwind"], "bootstrap": [], "webpack": [], "vite": [], "babel": [],
+        "react native": [], "flutter": [], "storybook": [], "web components": [],
+        "responsive design": [], "accessibility": ["a11y", "wcag"],
+    },
+    "backend": {
+        "node.js": ["nodejs"], "express": ["express.js"], "django": [], "flask": [],
+        "fastapi": [], "spring": ["spring boot"], "rails": ["ruby on rails"], "laravel": [],
+        ".net": ["dotnet", "asp.net"], "graphql apis": [], "rest": ["rest api", "restful", "rest apis"],
+        "grpc": [], "microservices": [], "websockets": [], "celery": [], "rabbitmq": [],
+        "kafka": ["apache kafka"], "nginx": [], "oauth": ["oauth2"], "jwt": [],
+    },
+    "data": {
+        "postgresql": ["postgres"], "mysql": [], "sqlite": [], "mongodb": ["mongo"], "redis": [],
+        "elasticsearch": ["elastic search"], "cassandra": [], "dynamodb": [], "snowflake": [],
+        "bigquery": [], "redshift": [], "oracle": [], "sql server": ["mssql"], "neo4j": [],
+        "spark": ["apache spark", "pyspark"], "hadoop": [], "airflow": ["apache airflow"],
+        "dbt": [], "etl": ["elt"], "data warehousing": ["data warehouse"], "data modeling": [],
+        "data pipelines": ["data pipeline"], "pandas": [], "numpy": [], "tableau": [],
+        "power bi": ["powerbi"], "looker": [], "excel": ["microsoft excel"], "data analysis": [],
+        "data visualization": [], "statistics": ["statistical analysis"], "a/b testing": ["ab testing"],
+    },
+    "machine_learning": {
+        "machine learning": ["ml"], "deep learning": [], "artificial intelligence": ["ai"],
+        "natural language processing": ["nlp"], "computer vision": [], "tensorflow": [],
+        "pytorch": [], "keras": [], "scikit-learn": ["sklearn", "scikit learn"], "xgboost": [],
+        "llm": ["llms", "large language models"], "generative ai": ["genai"], "mlops": [],
+        "reinforcement learning": [], "recommendation systems": ["recommender systems"],
+        "hugging face": ["huggingface"], "langchain": [], "openai api": [], "prompt engineering": [],
+        "feature engineering": [], "time series": [],
+    },
+    "cloud_devops": {
+        "aws": ["amazon web services"], "azure": ["microsoft azure"], "gcp": ["google cloud", "google cloud platform"],
+        "docker": [], "kubernetes": ["k8s"], "terraform": [], "ansible": [], "puppet": [], "chef": [],
+        "jenkins": [], "github actions": [], "gitlab ci": [], "circleci": [], "ci/cd": ["cicd", "continuous integration"],
+        "linux": ["unix"], "serverless": [], "lambda": ["aws lambda"], "ec2": [], "s3": [],
+        "cloudformation": [], "helm": [], "prometheus": [], "grafana": [], "datadog": [],
+        "splunk": [], "observability": [], "site reliability engineering": ["sre"],
+        "infrastructure as code": ["iac"], "networking": [], "load balancing": [],
+    },
+    "engineering_practices": {
+        "git": ["github", "gitlab", "version control"], "agile": [], "scrum": [], "kanban": [],
+        "test-driven development": ["tdd"], "unit testing": [], "integration testing": [],
+        "pytest": [], "jest": [], "cypress": [], "selenium": [], "code review": ["code reviews"],
+        "system design": [], "distributed systems": [], "object-oriented programming": ["oop"],
+        "design patterns": [], "api design": [], "performance optimization": [], "debugging": [],
+        "security": ["application security", "appsec"], "cryptography": [], "devops": [],
+        "jira": [], "confluence": [],
+    },
+    "design": {
+        "figma": [], "sketch": [], "adobe xd": [], "photoshop": ["adobe photoshop"],
+        "illustrator": ["adobe illustrator"], "indesign": [], "ux design": ["user experience"],
+        "ui design": ["user interface design"], "prototyping": [], "wireframing": ["wireframes"],
+        "user research": [], "usability testing": [], "design systems": [],
+    },
+    "marketing": {
+        "seo": ["search engine optimization"], "sem": ["search engine marketing"], "google analytics": [],
+        "content marketing": [], "email marketing": [], "social media marketing": ["social media"],
+        "hubspot": [], "salesforce": [], "marketo": [], "copywriting": [], "brand management": ["branding"],
+        "digital marketing": [], "ppc": ["pay per click"], "growth marketing": [], "market research": [],
+        "crm": [],
+    },
+    "business": {
+        "project management": [], "product management": [], "stakeholder management": [],
+        "budgeting": [], "forecasting": [], "financial modeling": [], "business analysis": [],
+        "requirements gathering": [], "process improvement": [], "lean": [], "six sigma": [],
+        "sales": [], "account management": [], "business development": [], "negotiation": [],
+        "customer service": ["customer support"], "operations": [], "supply chain": [],
+        "pmp": [], "okrs": ["okr"], "roadmapping": ["product roadmap"],
+    },
+}
+
+SOFT_SKILLS = {
+    "leadership": ["led teams", "team leadership"], "communication": ["communication skills"],
+    "teamwork": ["collaboration", "collaborative"], "problem solving": ["problem-solving"],
+    "analytical": ["analytical skills"], "mentoring": ["mentorship", "coaching"],
+    "time management": [], "adaptability": [], "critical thinking": [], "attention to detail": [],
+    "ownership": [], "creativity": [], "presentation skills": ["public speaking"],
+    "cross-functional": ["cross functional"], "self-starter": [], "strategic thinking": [],
+}
+
+# Category with the most matches decides job_category
+CATEGORY_JOB_TYPES = {
+    "programming_languages": "software_engineering",
+    "frontend": "software_engineering",
+    "backend": "software_engineering",
+    "engineering_practices": "software_engineering",
+    "cloud_devops": "devops",
+    "data": "data",
+    "machine_learning": "data_science",
+    "design": "design",
+    "marketing": "marketing",
+    "business": "business",
+}
+
+# Skills whose names are also common English words or single letters ("go", "R", "rest").
+# The forms listed here only match in that exact casing. Aliases, and canonical names that aren't
+# themselves one of these forms ("node.js" vs "Node"), still match case-insensitively.
+CASE_SENSITIVE_FORMS = {
+    "go": ["Go"],
+    "r": ["R"],
+    "c": ["C"],
+    "rust": ["Rust"],
+    "swift": ["Swift"],
+    "dart": ["Dart"],
+    "lua": ["Lua"],
+    "julia": ["Julia"],
+    "express": ["Express"],
+    "spring": ["Spring"],
+    "rest": ["REST", "RESTful"],
+    "lean": ["Lean"],
+    "chef": ["Chef"],
+    "puppet": ["Puppet"],
+    "lambda": ["Lambda"],
+    "oracle": ["Oracle"],
+    "sketch": ["Sketch"],
+    "helm": ["Helm"],
+    "node.js": ["Node"],
+    "ui design": ["UI"],
+    "ux design": ["UX"],
+}
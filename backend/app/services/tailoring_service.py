@@ -0,0 +1,284 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import Resume, JobDescription, TailoredResume, TailoredResumeSection
+from app.core.config import settings
+from app.core.metrics import STAGE_SECONDS, record_cache_lookup, timed
+from app.models.schemas import BatchTailoringRequest, TailoringRequest, TailoringResponse
+from app.services.ai_service import AIService
+
+SECTION_ORDER = ["contact", "summary", "experience", "education", "skills", "projects", "certifications"]
+
+
+def combine_sections(tailored_sections: Dict[str, Any]) -> str:
+    """Combine tailored sections into the full resume text"""
+    
+    return "\n\n".join([tailored_sections.get(section, "") for section in SECTION_ORDER]).strip()
+
+
+async def load_tailoring_inputs(db: AsyncSession, request: TailoringRequest) -> Tuple[Resume, JobDescription, Dict[str, Any]]:
+    """Fetch the resume, job description and its keywords for a tailoring request"""
+    
+    # Get resume and job description
+    resume = await db.get(Resume, request.resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    job_description = await db.get(JobDescription, request.job_description_id)
+    if not job_description:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    # Get keywords from job description
+    keywords = json.loads(job_description.extracted_keywords) if job_description.extracted_keywords else {}
+    
+    return resume, job_description, keywords
+
+
+def build_tailored_resume(resume_id: int, job_description_id: int, tailored_sections: Dict[str, Any]) -> TailoredResume:
+    """Build an unsaved TailoredResume row from tailored sections"""
+    
+    return TailoredResume(
+        resume_id=resume_id,
+        job_description_id=job_description_id,
+        tailored_content=combine_sections(tailored_sections),
+        is_one_page=tailored_sections.get("estimated_pages", 1.0) <= 1.0
+    )
+
+
+async def load_cached_sections(db: AsyncSession, fingerprints: Dict[str, str]) -> Dict[str, str]:
+    """Stored output for each section whose fingerprint has been tailored before"""
+    
+    if not fingerprints:
+        return {}
+    
+    rows = await db.execute(
+        select(TailoredResumeSection.fingerprint, TailoredResumeSection.content)
+        .where(TailoredResumeSection.fingerprint.in_(set(fingerprints.values())))
+        .order_by(TailoredResumeSection.id)
+    )
+    # Ascending ids, so the newest output wins
+    outputs = dict(rows.all())
+    cached = {name: outputs[fingerprint] for name, fingerprint in fingerprints.items() if fingerprint in outputs}
+    record_cache_lookup("tailored_section", True, len(cached))
+    record_cache_lookup("tailored_section", False, len(fingerprints) - len(cached))
+    return cached
+
+
+def build_section_rows(
+    tailored_resume_id: int,
+    sections: Dict[str, str],
+    fingerprints: Dict[str, str],
+    tailored_sections: Dict[str, Any]
+) -> List[TailoredResumeSection]:
+    """Section outputs worth caching for later re-tailoring"""
+    
+    # Fallback output has no token usage; don't let it stand in for a real rewrite
+    if not tailored_sections.get("token_usage"):
+        return []
+    
+    reused = set(tailored_sections.get("reused_sections") or [])
+    return [
+        TailoredResumeSection(
+            tailored_resume_id=tailored_resume_id,
+            section=name,
+            fingerprint=fingerprint,
+            content=tailored_sections[name]
+        )
+        for name, fingerprint in fingerprints.items()
+        # Unchanged text means the section's prompt failed
+        if name not in reused
+        and isinstance(tailored_sections.get(name), str)
+        and tailored_sections[name]
+        and tailored_sections[name] != sections.get(name)
+    ]
+
+
+def preview_content(tailored_content: str) -> str:
+    return tailored_content[:500] + "..." if len(tailored_content) > 500 else tailored_content
+
+
+async def store_tailored_resume(
+    db: AsyncSession,
+    request: TailoringRequest,
+    tailored_sections: Dict[str, Any],
+    sections: Optional[Dict[str, str]] = None,
+    fingerprints: Optional[Dict[str, str]] = None
+) -> TailoringResponse:
+    """Save tailored sections as a TailoredResume and build the API response"""
+    
+    # Create database record
+    db_tailored = build_tailored_resume(request.resume_id, request.job_description_id, tailored_sections)
+    
+    db.add(db_tailored)
+    if fingerprints:
+        await db.flush()
+        db.add_all(build_section_rows(db_tailored.id, sections or {}, fingerprints, tailored_sections))
+    await db.commit()
+    await db.refresh(db_tailored)
+    
+    return TailoringResponse(
+        success=True,
+        message="Resume tailored successfully",
+        tailored_resume_id=db_tailored.id,
+        preview_content=preview_content(db_tailored.tailored_content),
+        estimated_pages=tailored_sections.get("estimated_pages", 1.0),
+        token_usage=tailored_sections.get("token_usage"),
+        reused_sections=tailored_sections.get("reused_sections") or []
+    )
+
+
+@timed(STAGE_SECONDS, stage="tailor_and_store")
+async def tailor_and_store(
+    db: AsyncSession,
+    request: TailoringRequest,
+    ai_service: Optional[AIService] = None,
+    raise_on_error: bool = False
+) -> TailoringResponse:
+    """Tailor a stored resume for a stored job description and save the result"""
+    
+    resume, job_description, keywords = await load_tailoring_inputs(db, request)
+    ai_service = ai_service or AIService()
+    
+    # In sections mode, only sections whose inputs changed since they were last tailored go to the model
+    sections = ai_service._extract_resume_sections(resume.parsed_content)
+    fingerprints = ai_service.section_fingerprints(sections, keywords, request.mode)
+    cached_sections = await load_cached_sections(db, fingerprints)
+    
+    # Tailor resume
+    tailored_sections = await ai_service.tailor_resume(
+        resume_content=resume.parsed_content,
+        job_description=job_description.content,
+        keywords=keywords,
+        preserve_formatting=request.preserve_formatting,
+        sections=sections,
+        mode=request.mode,
+        cached_sections=cached_sections,
+        raise_on_error=raise_on_error
+    )
+    
+    return await store_tailored_resume(db, request, tailored_sections, sections, fingerprints)
+
+
+async def stream_tailoring(
+    db: AsyncSession,
+    request: TailoringRequest,
+    resume: Resume,
+    job_description: JobDescription,
+    keywords: Dict[str, Any],
+    ai_service: Optional[AIService] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ("section", ...) events as sections finish, then a ("done", response) event"""
+    
+    tailored_sections: Dict[str, Any] = {}
+    ai_service = ai_service or AIService()
+    
+    sections = ai_service._extract_resume_sections(resume.parsed_content)
+    fingerprints = ai_service.section_fingerprints(sections, keywords, request.mode)
+    cached_sections = await load_cached_sections(db, fingerprints)
+    
+    async for name, value in ai_service.tailor_resume_stream(
+        resume_content=resume.parsed_content,
+        job_description=job_description.content,
+        keywords=keywords,
+        preserve_formatting=request.preserve_formatting,
+        mode=request.mode,
+        sections=sections,
+        cached_sections=cached_sections
+    ):
+        tailored_sections[name] = value
+        if name in SECTION_ORDER:
+            yield "section", {"name": name, "content": value}
+    
+    response = await store_tailored_resume(db, request, tailored_sections, sections, fingerprints)
+    yield "done", response.model_dump()
+
+
+async def stream_batch_tailoring(
+    db: AsyncSession,
+    request: BatchTailoringRequest,
+    resume: Resume,
+    ai_service: Optional[AIService] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Tailor one resume against many job descriptions concurrently
+
+    Yields an ("item", ...) event per job description as it completes, then a
+    ("done", ...) event once every successful result has been inserted in a
+    single transaction.
+    """
+    
+    ai_service = ai_service or AIService()
+    job_description_ids = list(dict.fromkeys(request.job_description_ids))
+    job_descriptions = {
+        jd.id: jd for jd in
+        await db.scalars(select(JobDescription).where(JobDescription.id.in_(job_description_ids)))
+    }
+    
+    # Section extraction is identical for every posting; do it once
+    sections = ai_service._extract_resume_sections(resume.parsed_content)
+    semaphore = asyncio.Semaphore(settings.batch_tailoring_concurrency)
+    
+    # Look up every posting's cached sections up front; the session can't be shared by concurrent tasks
+    fingerprints: Dict[int, Dict[str, str]] = {}
+    cached_sections: Dict[int, Dict[str, str]] = {}
+    for jd_id, job_description in job_descriptions.items():
+        keywords = json.loads(job_description.extracted_keywords) if job_description.extracted_keywords else {}
+        fingerprints[jd_id] = ai_service.section_fingerprints(sections, keywords, request.mode)
+        cached_sections[jd_id] = await load_cached_sections(db, fingerprints[jd_id])
+    
+    async def tailor_one(job_description_id: int) -> Dict[str, Any]:
+        job_description = job_descriptions.get(job_description_id)
+        if job_description is None:
+            return {"job_description_id": job_description_id, "success": False, "error": "Job description not found"}
+        
+        keywords = json.loads(job_description.extracted_keywords) if job_description.extracted_keywords else {}
+        async with semaphore:
+            try:
+                tailored_sections = await ai_service.tailor_resume(
+                    resume_content=resume.parsed_content,
+                    job_description=job_description.content,
+                    keywords=keywords,
+                    preserve_formatting=request.preserve_formatting,
+                    sections=sections,
+                    mode=request.mode,
+                    cached_sections=cached_sections[job_description_id]
+                )
+            except Exception as e:
+                return {"job_description_id": job_description_id, "success": False, "error": str(e)}
+        
+        return {"job_description_id": job_description_id, "success": True, "sections": tailored_sections}
+    
+    rows = []
+    results = {}
+    for next_result in asyncio.as_completed([tailor_one(jd_id) for jd_id in job_description_ids]):
+        result = await next_result
+        item = {key: value for key, value in result.items() if key != "sections"}
+        if result["success"]:
+            row = build_tailored_resume(resume.id, result["job_description_id"], result["sections"])
+            rows.append(row)
+            results[row.job_description_id] = result["sections"]
+            item["preview_content"] = preview_content(row.tailored_content)
+            item["estimated_pages"] = result["sections"].get("estimated_pages", 1.0)
+            item["token_usage"] = result["sections"].get("token_usage")
+            item["reused_sections"] = result["sections"].get("reused_sections") or []
+        yield "item", item
+    
+    # One transaction for the whole batch instead of a commit per posting
+    db.add_all(rows)
+    await db.flush()
+    for row in rows:
+        db.add_all(build_section_rows(
+            row.id, sections, fingerprints[row.job_description_id], results[row.job_description_id]
+        ))
+    await db.commit()
+    
+    yield "done", {
+        "resume_id": resume.id,
+        "results": [
+            {"job_description_id": row.job_description_id, "tailored_resume_id": row.id}
+            for row in rows
+        ]
+    }
\ No newline at end of file
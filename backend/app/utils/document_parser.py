@@ -1,20 +1,25 @@
+import io
+import mmap
 import os
 import fitz  # PyMuPDF
 import docx
 import pdfplumber
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from fastapi import UploadFile, HTTPException
 import re
 
+from app.core.config import settings
+from app.core.metrics import PARSE_SECONDS, timed
+from app.core.worker_pool import ProcessWorkerPool, WorkerPoolSaturated, WorkerPoolTimeout
+
 class DocumentParser:
     """Parser for different document formats (PDF, DOCX, TXT)"""
     
     @staticmethod
-    async def parse_document(file: UploadFile) -> Dict[str, Any]:
-        """Parse uploaded document and extract content"""
+    def validate_file_type(filename: str) -> str:
+        """Return the lowercase extension of filename, rejecting unsupported types"""
         
-        # Validate file type
-        file_extension = os.path.splitext(file.filename)[1].lower()
+        file_extension = os.path.splitext(filename)[1].lower()
         allowed_extensions = ['.pdf', '.docx', '.txt']
         
         if file_extension not in allowed_extensions:
@@ -23,105 +28,174 @@ class DocumentParser:
                 detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
             )
         
+        return file_extension
+    
+    @staticmethod
+    async def parse_document(file: UploadFile) -> Dict[str, Any]:
+        """Parse uploaded document and extract content"""
+        
+        file_extension = DocumentParser.validate_file_type(file.filename)
+        content = await file.read()
+        
+        with timed(PARSE_SECONDS, file_type=file_extension.lstrip(".")):
+            return await DocumentParser._run_in_pool(DocumentParser.parse_bytes, content, file_extension)
+    
+    @staticmethod
+    async def parse_saved_file(file_path: str, file_extension: str) -> Dict[str, Any]:
+        """Parse a document already written to disk without loading it in this process"""
+        
+        with timed(PARSE_SECONDS, file_type=file_extension.lstrip(".")):
+            return await DocumentParser._run_in_pool(DocumentParser.parse_file, file_path, file_extension)
+    
+    @staticmethod
+    async def _run_in_pool(fn, *args) -> Dict[str, Any]:
         try:
-            if file_extension == '.pdf':
-                return await DocumentParser._parse_pdf(file)
-            elif file_extension == '.docx':
-                return await DocumentParser._parse_docx(file)
-            elif file_extension == '.txt':
-                return await DocumentParser._parse_txt(file)
+            # PyMuPDF/pdfplumber/python-docx are CPU-bound; keep them off the event loop
+            return await parse_pool.run(fn, *args)
+        except WorkerPoolSaturated:
+            raise HTTPException(status_code=429, detail="Parser is busy, please retry shortly")
+        except WorkerPoolTimeout:
+            raise HTTPException(status_code=504, detail="Timed out parsing document")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error parsing document: {str(e)}")
     
     @staticmethod
-    async def _parse_pdf(file: UploadFile) -> Dict[str, Any]:
-        """Parse PDF document using PyMuPDF and pdfplumber for better text extraction"""
+    def parse_file(file_path: str, file_extension: str) -> Dict[str, Any]:
+        """Parse a document on disk through a read-only memory map; runs inside a parse pool worker"""
         
-        # Read file content
-        content = await file.read()
+        if os.path.getsize(file_path) == 0:
+            return DocumentParser.parse_bytes(b"", file_extension)
+        
+        with open(file_path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return DocumentParser.parse_bytes(view, file_extension, file_path=file_path)
+    
+    @staticmethod
+    def parse_bytes(
+        content: Union[bytes, mmap.mmap],
+        file_extension: str,
+        file_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Parse raw document bytes; runs inside a parse pool worker"""
+        
+        if file_extension == '.pdf':
+            return DocumentParser._parse_pdf(content, file_path)
+        elif file_extension == '.docx':
+            # zipfile needs a seekable stream; let it read a saved file from disk directly
+            return DocumentParser._parse_docx(file_path or content)
+        elif file_extension == '.txt':
+            return DocumentParser._parse_txt(content)
+        raise ValueError(f"Unsupported file type: {file_extension}")
+    
+    @staticmethod
+    def _as_stream(content: Union[bytes, mmap.mmap]):
+        """File-like view over content; memory maps are used directly instead of copied"""
+        
+        if isinstance(content, mmap.mmap):
+            content.seek(0)
+            return content
+        return io.BytesIO(content)
+    
+    @staticmethod
+    def _parse_pdf(content: Union[bytes, mmap.mmap], file_path: Optional[str] = None) -> Dict[str, Any]:
+        """Parse PDF in a single PyMuPDF pass, using pdfplumber only for pages PyMuPDF found empty"""
         
-        # Try PyMuPDF first for better formatting preservation
         try:
-            doc = fitz.open(stream=content, filetype="pdf")
-            text_content = ""
-            
-            for page in doc:
-                text_content += page.get_text()
-            
+            # MuPDF reads files on disk itself, so a saved upload is never copied into Python memory
+            if file_path:
+                doc = fitz.open(file_path, filetype="pdf")
+            else:
+                doc = fitz.open(stream=content, filetype="pdf")
+        except Exception:
+            # PyMuPDF can't open it at all; let pdfplumber try every page
+            return DocumentParser._parse_pdf_with_pdfplumber(content)
+        
+        page_texts = []
+        layout = []
+        
+        try:
+            page_count = doc.page_count
+            for page_number, page in enumerate(doc):
+                # One extraction per page gives both the text and the block geometry
+                page_text = ""
+                for x0, y0, x1, y1, text, _block_no, block_type in page.get_text("blocks"):
+                    if block_type != 0:
+                        continue
+                    page_text += text
+                    layout.append({
+                        "page": page_number + 1,
+                        "bbox": [x0, y0, x1, y1],
+                        "text": text.strip()
+                    })
+                page_texts.append(page_text)
+        finally:
             doc.close()
-            
-            # If PyMuPDF doesn't extract much text, try pdfplumber
-            if len(text_content.strip()) < 100:
-                pdfplumber_doc = pdfplumber.open(content)
-                text_content = ""
+        
+        # Scanned or oddly encoded pages come back empty; retry only those with pdfplumber
+        empty_pages = [number + 1 for number, text in enumerate(page_texts) if not text.strip()]
+        if empty_pages:
+            with pdfplumber.open(DocumentParser._as_stream(content), pages=empty_pages) as pdfplumber_doc:
                 for page in pdfplumber_doc.pages:
-                    if page.extract_text():
-                        text_content += page.extract_text() + "\n"
-                pdfplumber_doc.close()
-            
-        except Exception:
-            # Fallback to pdfplumber
-            pdfplumber_doc = pdfplumber.open(content)
-            text_content = ""
+                    page_texts[page.page_number - 1] = (page.extract_text() or "") + "\n"
+        
+        return {
+            "content": "".join(page_texts).strip(),
+            "file_type": "pdf",
+            "pages": page_count,
+            "layout": layout
+        }
+    
+    @staticmethod
+    def _parse_pdf_with_pdfplumber(content: Union[bytes, mmap.mmap]) -> Dict[str, Any]:
+        """Parse PDF entirely with pdfplumber"""
+        
+        text_content = ""
+        with pdfplumber.open(DocumentParser._as_stream(content)) as pdfplumber_doc:
+            page_count = len(pdfplumber_doc.pages)
             for page in pdfplumber_doc.pages:
-                if page.extract_text():
-                    text_content += page.extract_text() + "\n"
-            pdfplumber_doc.close()
+                page_text = page.extract_text()
+                if page_text:
+                    text_content += page_text + "\n"
         
         return {
             "content": text_content.strip(),
             "file_type": "pdf",
-            "pages": len(fitz.open(stream=content, filetype="pdf"))
+            "pages": page_count,
+            "layout": []
         }
     
     @staticmethod
-    async def _parse_docx(file: UploadFile) -> Dict[str, Any]:
-        """Parse DOCX document"""
+    def _parse_docx(content: Union[bytes, str]) -> Dict[str, Any]:
+        """Parse DOCX document from bytes or a file path"""
         
-        content = await file.read()
+        doc = docx.Document(content if isinstance(content, str) else io.BytesIO(content))
+        text_content = ""
         
-        # Save temporarily to parse with python-docx
-        temp_path = f"/tmp/{file.filename}"
-        with open(temp_path, "wb") as f:
-            f.write(content)
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text_content += paragraph.text + "\n"
         
-        try:
-            doc = docx.Document(temp_path)
-            text_content = ""
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content += paragraph.text + "\n"
-            
-            # Extract tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text_content += " | ".join(row_text) + "\n"
-            
-            os.remove(temp_path)
-            
-            return {
-                "content": text_content.strip(),
-                "file_type": "docx",
-                "pages": DocumentParser._estimate_pages(text_content)
-            }
-            
-        except Exception as e:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            raise e
+        # Extract tables
+        for table in doc.tables:
+            for row in table.rows:
+                row_text = []
+                for cell in row.cells:
+                    if cell.text.strip():
+                        row_text.append(cell.text.strip())
+                if row_text:
+                    text_content += " | ".join(row_text) + "\n"
+        
+        return {
+            "content": text_content.strip(),
+            "file_type": "docx",
+            "pages": DocumentParser._estimate_pages(text_content)
+        }
     
     @staticmethod
-    async def _parse_txt(file: UploadFile) -> Dict[str, Any]:
+    def _parse_txt(content: Union[bytes, mmap.mmap]) -> Dict[str, Any]:
         """Parse plain text document"""
         
-        content = await file.read()
-        text_content = content.decode('utf-8')
+        text_content = content[:].decode('utf-8')
         
         return {
             "content": text_content.strip(),
@@ -183,4 +257,14 @@ class DocumentParser:
         for section in sections:
             sections[section] = sections[section].strip()
         
-        return sections 
\ No newline at end of file
+        return sections 
+
+
+# Process pool shared by all uploads in this worker
+parse_pool = ProcessWorkerPool(
+    name="parse",
+    max_workers=settings.parse_pool_workers,
+    max_pending=settings.parse_pool_max_pending,
+    timeout_seconds=settings.parse_job_timeout_seconds,
+    max_jobs_per_worker=settings.parse_pool_max_jobs_per_worker
+)
@@ -0,0 +1,60 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalObjectParser:
+    """Parse the top-level members of a JSON object as its text arrives in chunks"""
+    
+    def __init__(self):
+        self.buffer = ""
+        self.pos = -1  # index just past the opening brace, -1 until it is seen
+        self.finished = False
+        self._decoder = json.JSONDecoder()
+    
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Add text and return every (key, value) member completed by it"""
+        
+        self.buffer += text
+        members = []
+        
+        if self.pos < 0:
+            # Models sometimes write a sentence before the JSON; skip to the first brace
+            start = self.buffer.find("{")
+            if start < 0:
+                return members
+            self.pos = start + 1
+        
+        while not self.finished:
+            pos = self._skip(self.pos, ",")
+            if pos >= len(self.buffer):
+                break
+            if self.buffer[pos] == "}":
+                self.finished = True
+                break
+            
+            try:
+                key, pos = self._decoder.raw_decode(self.buffer, pos)
+                pos = self._skip(pos)
+                if pos >= len(self.buffer):
+                    break
+                if self.buffer[pos] != ":":
+                    raise ValueError(f"Expected ':' at position {pos}")
+                value, end = self._decoder.raw_decode(self.buffer, self._skip(pos + 1))
+            except json.JSONDecodeError:
+                # Member is still incomplete; wait for more text
+                break
+            
+            # A number may still be growing ("5" -> "5.0"); it is only done once a delimiter follows
+            after = self._skip(end)
+            if after >= len(self.buffer) or self.buffer[after] not in ",}":
+                break
+            
+            members.append((key, value))
+            self.pos = end
+        
+        return members
+    
+    def _skip(self, pos: int, extra: str = "") -> int:
+        while pos < len(self.buffer) and (self.buffer[pos].isspace() or self.buffer[pos] in extra):
+            pos += 1
+        return pos
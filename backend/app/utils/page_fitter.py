@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional, Tuple
+from weasyprint import CSS, HTML
+from weasyprint.document import Document, Page
+from app.core.config import settings
+
+# Applied on top of the template stylesheet; template sizes are in em, so the
+# container's font size scales type and spacing together
+FIT_STYLESHEET = """
+@page {{ margin: {top:.2f}px {right:.2f}px {bottom:.2f}px {left:.2f}px; }}
+.resume-container {{ font-size: {font_percent:.2f}%; }}
+"""
+
+
+def _content_height(page: Page) -> float:
+    """Used height of the document flow on a laid-out page, in px"""
+    page_box = page._page_box
+    try:
+        from weasyprint.formatting_structure.boxes import MarginBox
+        root = next(child for child in page_box.children if not isinstance(child, MarginBox))
+        return root.margin_height()
+    except (AttributeError, StopIteration):
+        return page_box.height
+
+
+def _page_margins(page: Page) -> Tuple[float, float, float, float]:
+    page_box = page._page_box
+    return page_box.margin_top, page_box.margin_right, page_box.margin_bottom, page_box.margin_left
+
+
+class PageFitter:
+    """Shrinks type, spacing and margins until the real layout fits a page budget"""
+    
+    def __init__(
+        self,
+        target_pages: int,
+        max_passes: int,
+        min_font_scale: float,
+        min_margin_scale: float,
+        tolerance: float
+    ):
+        self.target_pages = target_pages
+        # The full-size and fully-compressed layouts always run
+        self.max_passes = max(2, max_passes)
+        self.min_font_scale = min_font_scale
+        self.min_margin_scale = min_margin_scale
+        self.tolerance = tolerance
+    
+    def scales(self, compression: float) -> Tuple[float, float]:
+        """Font and margin scale for a compression level between 0 (template as-is) and 1 (floor)"""
+        font_scale = 1.0 - compression * (1.0 - self.min_font_scale)
+        margin_scale = 1.0 - compression * (1.0 - self.min_margin_scale)
+        return font_scale, margin_scale
+    
+    def layout(
+        self,
+        html: HTML,
+        stylesheets: List[CSS],
+        compression: float = 0.0,
+        margins: Optional[Tuple[float, float, float, float]] = None
+    ) -> Document:
+        """Lay out the parsed document at one compression level without writing a PDF"""
+        if compression <= 0 or margins is None:
+            return html.render(stylesheets=stylesheets)
+        
+        font_scale, margin_scale = self.scales(compression)
+        top, right, bottom, left = (margin * margin_scale for margin in margins)
+        override = CSS(string=FIT_STYLESHEET.format(
+            top=top, right=right, bottom=bottom, left=left, font_percent=font_scale * 100
+        ))
+        return html.render(stylesheets=[*stylesheets, override])
+    
+    def overflow(self, document: Document) -> float:
+        """Height of content past the last allowed page, in px"""
+        return sum(_content_height(page) for page in document.pages[self.target_pages:])
+    
+    def fit(self, html: HTML, stylesheets: List[CSS]) -> Tuple[Document, Dict[str, Any]]:
+        """Binary-search the smallest compression whose layout fits; at most max_passes layouts"""
+        
+        document = html.render(stylesheets=stylesheets)
+        passes = 1
+        overflow = self.overflow(document)
+        stats = {"overflow_px": round(overflow, 1)}
+        if len(document.pages) <= self.target_pages:
+            return document, self._stats(stats, document, 0.0, passes)
+        
+        first_page = document.pages[0]
+        margins = _page_margins(first_page)
+        usable = first_page._page_box.height * self.target_pages
+        
+        # If even the floor overflows there's nothing to search for; return the densest layout
+        floor = self.layout(html, stylesheets, 1.0, margins)
+        passes += 1
+        if len(floor.pages) > self.target_pages:
+            return floor, self._stats(stats, floor, 1.0, passes)
+        
+        # Invariant: `fits` lays out within the budget, `overflows` does not
+        fits, best = 1.0, floor
+        overflows = 0.0
+        # Text area shrinks with the square of the font scale, so aim the first probe there
+        needed = (usable / (usable + overflow)) ** 0.5 if overflow else 1.0
+        probe = (1.0 - needed) / (1.0 - self.min_font_scale) if self.min_font_scale < 1.0 else 1.0
+        
+        while passes < self.max_passes and fits - overflows > self.tolerance:
+            if not overflows < probe < fits:
+                probe = (overflows + fits) / 2
+            candidate = self.layout(html, stylesheets, probe, margins)
+            passes += 1
+            if len(candidate.pages) <= self.target_pages:
+                fits, best = probe, candidate
+            else:
+                overflows = probe
+            probe = (overflows + fits) / 2
+        
+        return best, self._stats(stats, best, fits, passes)
+    
+    def _stats(self, stats: Dict[str, Any], document: Document, compression: float, passes: int) -> Dict[str, Any]:
+        font_scale, margin_scale = self.scales(compression)
+        return {
+            **stats,
+            "page_count": len(document.pages),
+            "fits": len(document.pages) <= self.target_pages,
+            "font_scale": round(font_scale, 3),
+            "margin_scale": round(margin_scale, 3),
+            "passes": passes
+        }
+
+
+page_fitter = PageFitter(
+    target_pages=settings.pdf_fit_target_pages,
+    max_passes=settings.pdf_fit_max_passes,
+    min_font_scale=settings.pdf_fit_min_font_scale,
+    min_margin_scale=settings.pdf_fit_min_margin_scale,
+    tolerance=settings.pdf_fit_tolerance
+)
@@ -0,0 +1,71 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> List[str]:
+    """Validate a comma-separated fields= projection against a response schema"""
+    available = list(schema.model_fields)
+    if not fields:
+        return available
+
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(available)}"
+        )
+    return requested
+
+
+async def paginate(
+    db: AsyncSession,
+    model: Any,
+    schema: Type[BaseModel],
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str]
+) -> Dict[str, Any]:
+    """Newest-first keyset page over (created_at, id); only the projected columns are loaded"""
+
+    selected = parse_fields(fields, schema)
+    # id and created_at are always needed to build the next cursor
+    columns = {"id", "created_at", *selected}
+    query = select(model).options(load_only(*(getattr(model, name) for name in columns)))
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+
+    rows = (await db.scalars(query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "items": [{name: getattr(row, name) for name in selected} for row in rows],
+        "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    }
@@ -1,8 +1,12 @@
 import os
-from weasyprint import HTML, CSS
-from jinja2 import Template
-from typing import Dict, Any
+from weasyprint import HTML
+from typing import Dict, Any, Optional, Tuple
 from app.core.config import settings
+from app.core.metrics import PDF_FIT_PASSES, PDF_RENDER_SECONDS, STAGE_SECONDS, timed
+from app.core.worker_pool import ProcessWorkerPool
+from app.utils.page_fitter import page_fitter
+from app.utils.template_registry import template_registry
+import time
 import uuid
 
 class PDFGenerator:
@@ -16,196 +20,50 @@ class PDFGenerator:
     def generate_pdf(self, resume_data: Dict[str, Any], template_name: str = "professional") -> str:
         """Generate PDF from resume data"""
         
-        # Load template
-        template_path = os.path.join(self.template_dir, f"{template_name}.html")
-        
-        if not os.path.exists(template_path):
-            template_path = os.path.join(self.template_dir, "professional.html")
-        
-        with open(template_path, 'r') as f:
-            template_content = f.read()
-        
-        # Render template with data
-        template = Template(template_content)
-        html_content = template.render(**resume_data)
+        html_content = self.render_html(resume_data, template_name)
         
         # Generate unique filename
         filename = f"resume_{uuid.uuid4().hex[:8]}.pdf"
         output_path = os.path.join(self.output_dir, filename)
         
-        # Generate PDF
-        HTML(string=html_content).write_pdf(
-            output_path,
-            stylesheets=[self._get_css_styles()]
-        )
+        # Generate PDF, fitted to the page budget
+        _render_pdf_in_worker(html_content, output_path, template_name)
         
         return filename
     
-    def _get_css_styles(self) -> CSS:
-        """Get CSS styles for professional resume formatting"""
-        
-        css_content = """
-        @page {
-            size: A4;
-            margin: 0.75in;
-            @top-center {
-                content: "";
-            }
-            @bottom-center {
-                content: "";
-            }
-        }
-        
-        body {
-            font-family: 'Arial', 'Helvetica', sans-serif;
-            font-size: 11pt;
-            line-height: 1.4;
-            color: #333;
-            margin: 0;
-            padding: 0;
-        }
-        
-        .header {
-            text-align: center;
-            margin-bottom: 20px;
-            border-bottom: 2px solid #2c3e50;
-            padding-bottom: 10px;
-        }
-        
-        .name {
-            font-size: 24pt;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 5px;
-        }
-        
-        .contact-info {
-            font-size: 10pt;
-            color: #666;
-            margin-bottom: 5px;
-        }
-        
-        .section {
-            margin-bottom: 15px;
-        }
-        
-        .section-title {
-            font-size: 14pt;
-            font-weight: bold;
-            color: #2c3e50;
-            border-bottom: 1px solid #bdc3c7;
-            margin-bottom: 8px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        
-        .job-title {
-            font-weight: bold;
-            color: #2c3e50;
-            font-size: 12pt;
-        }
-        
-        .company {
-            font-weight: bold;
-            color: #34495e;
-        }
-        
-        .date {
-            color: #7f8c8d;
-            font-style: italic;
-        }
-        
-        .job-description {
-            margin-left: 20px;
-            margin-top: 5px;
-        }
-        
-        .job-description ul {
-            margin: 5px 0;
-            padding-left: 20px;
-        }
-        
-        .job-description li {
-            margin-bottom: 3px;
-        }
-        
-        .skills-list {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-        }
-        
-        .skill-item {
-            background-color: #ecf0f1;
-            padding: 3px 8px;
-            border-radius: 3px;
-            font-size: 10pt;
-        }
-        
-        .education-item {
-            margin-bottom: 8px;
-        }
-        
-        .degree {
-            font-weight: bold;
-            color: #2c3e50;
-        }
-        
-        .school {
-            color: #34495e;
-        }
-        
-        .summary {
-            font-style: italic;
-            color: #555;
-            margin-bottom: 15px;
-        }
-        
-        .project-item {
-            margin-bottom: 10px;
-        }
-        
-        .project-title {
-            font-weight: bold;
-            color: #2c3e50;
-        }
+    @timed(STAGE_SECONDS, stage="pdf_generate")
+    async def generate_pdf_async(
+        self,
+        resume_data: Dict[str, Any],
+        template_name: str = "professional",
+        filename: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Generate PDF from resume data on the render pool without blocking the event loop
+        
+        Returns the filename and the page fitter's stats, including the measured page count.
+        """
         
-        .certification-item {
-            margin-bottom: 5px;
-        }
+        html_content = self.render_html(resume_data, template_name)
         
-        .certification-name {
-            font-weight: bold;
-            color: #2c3e50;
-        }
+        filename = filename or f"resume_{uuid.uuid4().hex[:8]}.pdf"
+        output_path = os.path.join(self.output_dir, filename)
         
-        .certification-issuer {
-            color: #7f8c8d;
-        }
+        fit = await render_pool.run(_render_pdf_in_worker, html_content, output_path, template_name)
+        # Measured in the worker process, so it excludes time spent queued for the pool
+        PDF_RENDER_SECONDS.observe(fit["render_seconds"])
+        PDF_FIT_PASSES.observe(fit["passes"])
         
-        /* Ensure one page layout */
-        .resume-container {
-            max-height: 100vh;
-            overflow: hidden;
-        }
+        return filename, fit
+    
+    def render_html(self, resume_data: Dict[str, Any], template_name: str = "professional") -> str:
+        """Render the resume HTML for a template"""
         
-        /* Responsive adjustments */
-        @media print {
-            body {
-                font-size: 10pt;
-            }
-            
-            .name {
-                font-size: 20pt;
-            }
-            
-            .section-title {
-                font-size: 12pt;
-            }
-        }
-        """
+        if not template_registry.has_template(template_name):
+            template_name = "professional"
         
-        return CSS(string=css_content)
+        # Compiled templates are cached by the registry's Jinja environment
+        template = template_registry.get_template(template_name)
+        return template.render(**resume_data)
     
     def create_resume_data(self, sections: Dict[str, str]) -> Dict[str, Any]:
         """Convert sections to structured data for template"""
@@ -256,4 +114,32 @@ class PDFGenerator:
             "skills": skills,
             "projects": sections.get("projects", ""),
             "certifications": sections.get("certifications", "")
-        } 
\ No newline at end of file
+        } 
+
+
+def _init_render_worker():
+    """Preload CSS and fonts so the first real render in a worker is not cold"""
+    stylesheets = [template_registry.get_stylesheet("professional")]
+    # Laying out a tiny document forces fontconfig/Pango to load the font set
+    HTML(string="<p>warm up</p>").render(stylesheets=stylesheets)
+
+
+def _render_pdf_in_worker(html_content: str, output_path: str, template_name: str = "professional") -> Dict[str, Any]:
+    """Fit rendered HTML to the page budget and write it as a PDF; runs inside a render pool worker"""
+    start = time.perf_counter()
+    stylesheets = [template_registry.get_stylesheet(template_name)]
+    # Parse once: every fitting pass lays out the same tree, and the PDF is written from the chosen layout
+    document, fit = page_fitter.fit(HTML(string=html_content), stylesheets)
+    document.write_pdf(output_path)
+    fit["render_seconds"] = time.perf_counter() - start
+    return fit
+
+
+render_pool = ProcessWorkerPool(
+    name="render",
+    max_workers=settings.render_pool_workers,
+    max_pending=settings.render_pool_max_pending,
+    timeout_seconds=settings.render_job_timeout_seconds,
+    max_jobs_per_worker=settings.render_pool_max_jobs_per_worker,
+    initializer=_init_render_worker
+)
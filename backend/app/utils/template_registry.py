@@ -0,0 +1,84 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from weasyprint import CSS
+from app.core.config import settings
+
+
+class TemplateRegistry:
+    """Loads resume templates and stylesheets once and reloads them when the file changes"""
+    
+    def __init__(self, template_dir: str, bytecode_cache_dir: str):
+        self.template_dir = template_dir
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        # auto_reload makes Jinja compare the file mtime before reusing a compiled template
+        self.environment = Environment(
+            loader=FileSystemLoader(template_dir),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir),
+            auto_reload=True
+        )
+        self._stylesheets: Dict[str, Tuple[int, CSS]] = {}
+        self._versions: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+    
+    def has_template(self, name: str) -> bool:
+        """Check whether an HTML template with this name exists"""
+        return os.path.exists(os.path.join(self.template_dir, f"{name}.html"))
+    
+    def get_template(self, name: str) -> Template:
+        """Get the compiled Jinja template for a template name"""
+        return self.environment.get_template(f"{name}.html")
+    
+    def stylesheet_path(self, name: str) -> str:
+        """Path of the stylesheet for a template, falling back to the professional one"""
+        path = os.path.join(self.template_dir, f"{name}.css")
+        if not os.path.exists(path):
+            path = os.path.join(self.template_dir, "professional.css")
+        return path
+    
+    def get_stylesheet(self, name: str) -> CSS:
+        """Get the parsed WeasyPrint stylesheet for a template name"""
+        path = self.stylesheet_path(name)
+        mtime = os.stat(path).st_mtime_ns
+        
+        with self._lock:
+            cached = self._stylesheets.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        
+        stylesheet = CSS(filename=path)
+        
+        with self._lock:
+            self._stylesheets[path] = (mtime, stylesheet)
+        return stylesheet
+    
+    def get_version(self, name: str) -> str:
+        """Content hash of a template's HTML and CSS, used to key rendered output"""
+        if not self.has_template(name):
+            name = "professional"
+        html_path = os.path.join(self.template_dir, f"{name}.html")
+        css_path = self.stylesheet_path(name)
+        mtimes = (os.stat(html_path).st_mtime_ns, os.stat(css_path).st_mtime_ns)
+        
+        with self._lock:
+            cached = self._versions.get(name)
+            if cached and cached[0] == mtimes:
+                return cached[1]
+        
+        digest = hashlib.sha256()
+        for path in (html_path, css_path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        version = digest.hexdigest()[:16]
+        
+        with self._lock:
+            self._versions[name] = (mtimes, version)
+        return version
+
+
+template_registry = TemplateRegistry(
+    template_dir=os.path.join(os.path.dirname(__file__), "templates"),
+    bytecode_cache_dir=settings.template_cache_dir
+)
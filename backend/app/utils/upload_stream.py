@@ -0,0 +1,38 @@
+import hashlib
+import os
+from typing import Any, Dict
+import aiofiles
+from fastapi import UploadFile, HTTPException
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def save_upload(file: UploadFile, file_path: str, max_bytes: int) -> Dict[str, Any]:
+    """Stream an upload to disk in one pass, enforcing max_bytes and hashing as it goes"""
+    
+    size = 0
+    digest = hashlib.sha256()
+    
+    try:
+        async with aiofiles.open(file_path, 'wb') as f:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {max_bytes // (1024*1024)}MB"
+                    )
+                
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        # Never leave a partial file behind
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    
+    return {"size": size, "sha256": digest.hexdigest()}
@@ -0,0 +1,57 @@
+import zipfile
+from typing import Iterator, List
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back instead of keeping them"""
+    
+    def __init__(self):
+        self.chunks: List[bytes] = []
+    
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ZipStream:
+    """Build a ZIP archive incrementally; only the chunk being written is held in memory"""
+    
+    def __init__(self, compression: int = zipfile.ZIP_STORED):
+        self._sink = _ChunkSink()
+        # The sink can't seek, so zipfile writes sizes in data descriptors after each entry
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+    
+    def add_file(self, arcname: str, path: str) -> Iterator[bytes]:
+        """Yield the archive bytes for one file as it is read from disk"""
+        with open(path, "rb") as source, self._zip.open(arcname, mode="w") as entry:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                entry.write(chunk)
+                data = self._sink.drain()
+                if data:
+                    yield data
+        # Closing the entry writes its data descriptor
+        data = self._sink.drain()
+        if data:
+            yield data
+    
+    def add_bytes(self, arcname: str, data: bytes) -> bytes:
+        self._zip.writestr(arcname, data)
+        return self._sink.drain()
+    
+    def close(self) -> bytes:
+        """Write the central directory and return the final bytes"""
+        self._zip.close()
+        return self._sink.drain()
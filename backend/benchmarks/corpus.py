@@ -0,0 +1,143 @@
+"""Synthetic resumes (TXT/DOCX/PDF) and job descriptions for the benchmarks"""
+import json
+import os
+import random
+from typing import Dict, List
+
+SIZES = {
+    # name: (jobs, bullets per job, projects)
+    "small": (2, 3, 1),
+    "medium": (4, 5, 2),
+    "large": (8, 8, 4),
+}
+FORMATS = (".txt", ".docx", ".pdf")
+
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim", "Haddad", "Larsen"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Hooli", "Vandelay", "Soylent"]
+TITLES = ["Software Engineer", "Senior Backend Engineer", "Data Engineer", "Platform Engineer", "Full Stack Developer"]
+SKILLS = [
+    "Python", "Java", "Go", "TypeScript", "JavaScript", "React", "Node.js", "Django", "FastAPI", "Flask",
+    "PostgreSQL", "MySQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Terraform",
+    "Spark", "Airflow", "GraphQL", "REST", "CI/CD", "Linux", "Pandas", "NumPy", "TensorFlow", "PyTorch",
+]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Shipped", "Refactored"]
+OBJECTS = [
+    "a billing pipeline", "the search service", "internal developer tooling", "a real-time analytics platform",
+    "the payments API", "customer onboarding flows", "a feature store", "the deployment system",
+]
+OUTCOMES = [
+    "cutting latency by 40%", "serving 2M requests per day", "reducing cloud spend by 25%",
+    "improving reliability to 99.95%", "halving build times", "supporting 10x traffic growth",
+]
+
+
+def _bullet(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(SKILLS, 2))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} with {skills}, {rng.choice(OUTCOMES)}"
+
+
+def resume_text(rng: random.Random, size: str) -> str:
+    jobs, bullets, projects = SIZES[size]
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com",
+        f"(555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(3, 15)} years of experience in "
+        f"{', '.join(rng.sample(SKILLS, 4))}.",
+        "",
+        "EXPERIENCE",
+    ]
+    for job in range(jobs):
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({2022 - 2 * job - 2}-{2022 - 2 * job})")
+        lines.extend(_bullet(rng) for _ in range(bullets))
+        lines.append("")
+    lines += ["EDUCATION", f"B.S. Computer Science, State University ({2010 - rng.randint(0, 8)})", ""]
+    lines += ["SKILLS", ", ".join(rng.sample(SKILLS, 12)), ""]
+    lines.append("PROJECTS")
+    for _ in range(projects):
+        lines.append(f"{rng.choice(OBJECTS).capitalize()}: open-source tool using {', '.join(rng.sample(SKILLS, 3))}")
+    lines += ["", "CERTIFICATIONS", "AWS Certified Solutions Architect"]
+    return "\n".join(lines)
+
+
+def job_description_text(rng: random.Random) -> Dict[str, str]:
+    required = rng.sample(SKILLS, 6)
+    preferred = rng.sample([skill for skill in SKILLS if skill not in required], 3)
+    title = rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    content = "\n".join([
+        f"{title} at {company}",
+        "",
+        "About the role:",
+        f"We are looking for a {title.lower()} to work on {rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}.",
+        "",
+        "Responsibilities:",
+        *(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(5)),
+        "",
+        "Requirements:",
+        f"- {rng.randint(2, 8)}+ years of experience with {required[0]} and {required[1]}",
+        *(f"- Experience with {skill}" for skill in required[2:]),
+        "",
+        "Nice to have:",
+        *(f"- {skill}" for skill in preferred),
+        "",
+        f"{company} is an equal opportunity employer. We offer health, dental and vision coverage and 401(k).",
+    ])
+    return {"title": title, "company": company, "content": content}
+
+
+def _write_docx(path: str, text: str):
+    import docx
+    document = docx.Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def _write_pdf(path: str, text: str, lines_per_page: int = 55):
+    import fitz
+    document = fitz.open()
+    lines = text.split("\n")
+    for start in range(0, len(lines), lines_per_page):
+        page = document.new_page()
+        page.insert_text((54, 54), "\n".join(lines[start:start + lines_per_page]), fontsize=9)
+    document.save(path)
+    document.close()
+
+
+def generate(directory: str, per_size: int = 3, job_descriptions: int = 20, seed: int = 7) -> Dict[str, List]:
+    """Write the corpus to directory (once per seed and shape) and return its manifest"""
+
+    manifest_path = os.path.join(directory, f"manifest_{seed}_{per_size}_{job_descriptions}.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    resumes = []
+    for size in SIZES:
+        for index in range(per_size):
+            text = resume_text(rng, size)
+            for extension in FORMATS:
+                path = os.path.join(directory, f"resume_{size}_{index}{extension}")
+                if extension == ".txt":
+                    with open(path, "w") as f:
+                        f.write(text)
+                elif extension == ".docx":
+                    _write_docx(path, text)
+                else:
+                    _write_pdf(path, text)
+                resumes.append({"size": size, "format": extension, "path": path, "text": text})
+
+    manifest = {
+        "resumes": resumes,
+        "job_descriptions": [job_description_text(rng) for _ in range(job_descriptions)],
+    }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    return manifest
@@ -0,0 +1,75 @@
+"""Latency, throughput and memory measurement shared by the benchmarks"""
+import asyncio
+import resource
+import sys
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    """Throughput and latency percentiles for one benchmark (latencies in seconds)"""
+    ordered = sorted(latencies)
+    return {
+        "iterations": len(ordered),
+        "throughput_per_s": round(len(ordered) / elapsed, 3) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+    }
+
+
+def measure(fn: Callable[[int], Any], iterations: int, warmup: int = 3) -> Dict[str, Any]:
+    """Time fn(i) sequentially; fn receives the iteration number so it can rotate inputs"""
+    for i in range(warmup):
+        fn(i)
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        call_start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - call_start)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+async def measure_async(
+    fn: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    warmup: int = 3,
+    concurrency: int = 1
+) -> Dict[str, Any]:
+    """Time fn(i) with up to `concurrency` calls in flight; throughput is over the whole run"""
+    for i in range(warmup):
+        await fn(i)
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call(i: int):
+        async with semaphore:
+            call_start = time.perf_counter()
+            await fn(i)
+            latencies.append(time.perf_counter() - call_start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed_call(i) for i in range(iterations)))
+    result = summarize(latencies, time.perf_counter() - start)
+    result["concurrency"] = concurrency
+    return result
+
+
+def peak_rss() -> Dict[str, float]:
+    """Peak resident set size of this process and of its largest finished child, in MB"""
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "peak_children_rss_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1),
+    }
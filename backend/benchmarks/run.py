@@ -0,0 +1,206 @@
+"""Run the offline benchmarks and optionally save or compare against a baseline
+
+Run from backend/:
+
+    python -m benchmarks.run                                # everything
+    python -m benchmarks.run --only parse_document,extract_sections
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 15
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from benchmarks import corpus
+from benchmarks.measure import peak_rss
+from benchmarks.stub_openai import serve
+from benchmarks.suites import BENCHMARKS
+
+# For each reported field: True when higher is better
+FIELDS = {
+    "throughput_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+
+def run_benchmark(name: str, options: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one benchmark in this process, inside a fresh app working directory"""
+
+    run_dir = os.path.join(options["work_dir"], f"run_{name}")
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(run_dir)
+    os.chdir(run_dir)
+    os.environ.setdefault("openai_api_key", "benchmark")
+    os.environ.setdefault("database_url", "sqlite:///./benchmark.db")
+
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
+    try:
+        results = BENCHMARKS[name](options, manifest)
+    except (ImportError, OSError) as e:
+        # WeasyPrint needs system libraries (pango) that may not be installed
+        return {name: {"skipped": f"{type(e).__name__}: {e}"}}
+    except Exception as e:
+        traceback.print_exc()
+        return {name: {"error": f"{type(e).__name__}: {e}"}}
+
+    rss = peak_rss()
+    for result in results.values():
+        result.update(rss)
+    return results
+
+
+def _child(name: str, options: Dict[str, Any], manifest: Dict[str, Any], queue):
+    queue.put(run_benchmark(name, options, manifest))
+
+
+def run_isolated(name: str, options: Dict[str, Any], manifest: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one benchmark in a fresh process so imports, caches and peak RSS don't leak between them"""
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(name, options, manifest, queue))
+    process.start()
+    results = None
+    while results is None:
+        try:
+            results = queue.get(timeout=1)
+        except Exception:
+            if not process.is_alive():
+                results = {name: {"error": f"benchmark process exited with code {process.exitcode}"}}
+    process.join()
+    return results
+
+
+def start_stub(latency_ms: float, jitter_ms: float) -> multiprocessing.Process:
+    """Start the stub OpenAI server and point the app at it before anything imports the settings"""
+
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    stub = context.Process(target=serve, args=(0, latency_ms, jitter_ms, ready), daemon=True)
+    stub.start()
+    port = ready.get(timeout=30)
+    os.environ["openai_base_url"] = f"http://127.0.0.1:{port}/v1"
+    # Benchmark the pipeline, not the client-side rate limiter
+    os.environ.setdefault("openai_rpm_limit", str(10 ** 6))
+    os.environ.setdefault("openai_tpm_limit", str(10 ** 9))
+    return stub
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Print deltas against the baseline; return the regressions beyond threshold percent"""
+
+    regressions = []
+    print(f"\nCompared with baseline (regression threshold {threshold:g}%):")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "skipped" in result or "error" in result or "skipped" in base or "error" in base:
+            continue
+        deltas = []
+        for field, higher_is_better in FIELDS.items():
+            if not base.get(field) or field not in result:
+                continue
+            change = (result[field] - base[field]) / base[field] * 100
+            deltas.append(f"{field} {change:+.1f}%")
+            worse = -change if higher_is_better else change
+            if worse > threshold:
+                regressions.append(f"{name} {field}: {base[field]} -> {result[field]} ({change:+.1f}%)")
+        print(f"  {name:<44} {', '.join(deltas)}")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict]):
+    print(f"\n{'benchmark':<44} {'iters':>6} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'rss MB':>8}")
+    for name, result in results.items():
+        if "skipped" in result or "error" in result:
+            print(f"{name:<44} {'skipped' if 'skipped' in result else 'error'}: {result.get('skipped') or result.get('error')}")
+            continue
+        print(
+            f"{name:<44} {result['iterations']:>6} {result['throughput_per_s']:>10.2f} "
+            f"{result['p50_ms']:>10.2f} {result['p99_ms']:>10.2f} {result['peak_rss_mb']:>8.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for parsing, section extraction, rendering and tailoring")
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1, help="requests in flight for async benchmarks")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="stub OpenAI response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--mode", choices=["full", "sections"], default="full", help="tailoring mode")
+    parser.add_argument("--warm", action="store_true", help="let tailoring reuse cached sections between calls")
+    parser.add_argument("--work-dir", default=os.path.join(tempfile.gettempdir(), "resume_optimizer_benchmarks"))
+    parser.add_argument("--no-isolate", action="store_true", help="run every benchmark in this process")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare with a JSON file written by --save")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent worse that counts as a regression")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    work_dir = os.path.abspath(args.work_dir)
+    options = {
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "mode": args.mode,
+        "warm": args.warm,
+        "work_dir": work_dir,
+    }
+    manifest = corpus.generate(os.path.join(work_dir, "corpus"))
+
+    stub = start_stub(args.latency_ms, args.jitter_ms) if "tailor_resume" in names else None
+    try:
+        results = {}
+        for name in names:
+            print(f"Running {name}...", flush=True)
+            if args.no_isolate:
+                results.update(run_benchmark(name, options, manifest))
+            else:
+                results.update(run_isolated(name, options, manifest))
+    finally:
+        if stub is not None:
+            stub.kill()
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "options": {key: value for key, value in options.items() if key != "work_dir"},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Local stand-in for the OpenAI chat completions API with configurable latency
+
+Run standalone with `python -m benchmarks.stub_openai --port 8089 --latency-ms 800`
+and point the backend at it with `openai_base_url=http://127.0.0.1:8089/v1`.
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+SECTION_TEXT = {
+    "summary": "Backend engineer focused on reliable, well-tested Python services.",
+    "experience": "\n".join(
+        f"- Delivered {item} using Python, AWS and Kubernetes, improving throughput by {10 * (i + 1)}%"
+        for i, item in enumerate(["a billing pipeline", "the search service", "internal tooling", "an analytics platform"])
+    ),
+    "skills": "Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, AWS, Terraform",
+    "projects": "Open-source job scheduler built with Python and Redis",
+}
+KEYWORDS = {
+    "technical_skills": ["Python", "AWS", "Docker", "Kubernetes", "PostgreSQL"],
+    "required_qualifications": ["3+ years of backend experience"],
+    "preferred_qualifications": ["Terraform"],
+    "responsibilities": ["Build and operate services"],
+    "industry_keywords": ["SaaS"],
+    "experience_level": "mid",
+    "job_category": "software_engineering",
+}
+
+
+def completion_text(prompt: str) -> str:
+    """A plausible reply for each prompt the backend sends"""
+    section = re.search(r"Rewrite the (\w+) section", prompt)
+    if section:
+        return SECTION_TEXT.get(section.group(1), "Tailored section content.")
+    if "Analyze the following job description" in prompt:
+        return json.dumps(KEYWORDS)
+    sections = {"contact": "Alex Smith\nalex@example.com", **SECTION_TEXT}
+    sections.update({"education": "B.S. Computer Science", "certifications": "", "word_count": 320, "estimated_pages": 1.0})
+    return json.dumps(sections)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency_seconds = 0.0
+    jitter_seconds = 0.0
+
+    def log_message(self, format: str, *args: Any):
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        prompt = " ".join(message.get("content") or "" for message in request.get("messages", []))
+        content = completion_text(prompt)
+        time.sleep(max(0.0, self.latency_seconds + random.uniform(-self.jitter_seconds, self.jitter_seconds)))
+
+        if request.get("stream"):
+            self._send_stream(request, content)
+        else:
+            self._send_json(request, content, prompt)
+
+    def _send_json(self, request: Dict[str, Any], content: str, prompt: str):
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        body = json.dumps({
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, request: Dict[str, Any], content: str):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for start in range(0, len(content), 16):
+            chunk = {
+                "id": "chatcmpl-benchmark",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4"),
+                "choices": [{"index": 0, "delta": {"content": content[start:start + 16]}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+
+def make_server(port: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> ThreadingHTTPServer:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "latency_seconds": latency_ms / 1000,
+        "jitter_seconds": jitter_ms / 1000,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(port: int, latency_ms: float, jitter_ms: float, ready=None):
+    """Run the stub until killed; ready (a multiprocessing queue) receives the bound port"""
+    server = make_server(port, latency_ms, jitter_ms)
+    if ready is not None:
+        ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    print(f"Stub OpenAI API on http://127.0.0.1:{args.port}/v1")
+    serve(args.port, args.latency_ms, args.jitter_ms)
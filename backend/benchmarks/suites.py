@@ -0,0 +1,135 @@
+"""The benchmarks; each one runs in its own process with the app's working directory set up"""
+import asyncio
+import io
+import os
+from typing import Any, Callable, Dict
+
+from benchmarks.measure import measure, measure_async
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def _resumes(corpus: Dict[str, Any], **filters: str):
+    return [resume for resume in corpus["resumes"] if all(resume[key] == value for key, value in filters.items())]
+
+
+def bench_parse_document(options: Dict[str, Any], corpus: Dict[str, Any]) -> Results:
+    """DocumentParser.parse_document per file type, through the parse pool like an upload"""
+    from fastapi import UploadFile
+    from app.utils.document_parser import DocumentParser, parse_pool
+
+    async def run() -> Results:
+        results = {}
+        for extension in (".txt", ".docx", ".pdf"):
+            files = []
+            for resume in _resumes(corpus, format=extension):
+                with open(resume["path"], "rb") as f:
+                    files.append((os.path.basename(resume["path"]), f.read()))
+
+            async def parse(i: int, files=files):
+                filename, data = files[i % len(files)]
+                await DocumentParser.parse_document(UploadFile(file=io.BytesIO(data), filename=filename))
+
+            results[f"parse_document[{extension.lstrip('.')}]"] = await measure_async(
+                parse, options["iterations"], concurrency=options["concurrency"]
+            )
+        return results
+
+    try:
+        return asyncio.run(run())
+    finally:
+        parse_pool.shutdown()
+
+
+def bench_extract_sections(options: Dict[str, Any], corpus: Dict[str, Any]) -> Results:
+    """Both section extractors over resumes of each size"""
+    from app.services.ai_service import AIService
+    from app.utils.document_parser import DocumentParser
+
+    extractors = {
+        "document_parser": DocumentParser.extract_resume_sections,
+        "ai_service": AIService()._extract_resume_sections,
+    }
+    results = {}
+    for size in ("small", "medium", "large"):
+        texts = [resume["text"] for resume in _resumes(corpus, format=".txt", size=size)]
+        for name, extract in extractors.items():
+            results[f"extract_sections[{name},{size}]"] = measure(
+                lambda i, extract=extract, texts=texts: extract(texts[i % len(texts)]),
+                options["iterations"] * 10
+            )
+    return results
+
+
+def bench_generate_pdf(options: Dict[str, Any], corpus: Dict[str, Any]) -> Results:
+    """PDFGenerator.generate_pdf in-process, including one-page fitting"""
+    from app.utils.document_parser import DocumentParser
+    from app.utils.pdf_generator import PDFGenerator
+
+    generator = PDFGenerator()
+    results = {}
+    for size in ("small", "medium", "large"):
+        resume_data = [
+            generator.create_resume_data(DocumentParser.extract_resume_sections(resume["text"]))
+            for resume in _resumes(corpus, format=".txt", size=size)
+        ]
+
+        def generate(i: int, resume_data=resume_data):
+            filename = generator.generate_pdf(resume_data[i % len(resume_data)])
+            os.remove(os.path.join(generator.output_dir, filename))
+
+        results[f"generate_pdf[{size}]"] = measure(generate, options["iterations"])
+    return results
+
+
+def bench_tailor_resume(options: Dict[str, Any], corpus: Dict[str, Any]) -> Results:
+    """End-to-end POST /api/tailor-resume against the stub OpenAI server started by the runner"""
+    if not os.environ.get("openai_base_url"):
+        raise RuntimeError("openai_base_url is not set; run through benchmarks.run so the stub server is started")
+    return asyncio.run(_tailor_resume(options, corpus))
+
+
+async def _tailor_resume(options: Dict[str, Any], corpus: Dict[str, Any]) -> Results:
+    import httpx
+    import main
+    from app.core.config import settings
+
+    await main.app.router.startup()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=300
+        ) as client:
+            resume = _resumes(corpus, format=".txt", size="medium")[0]
+            with open(resume["path"], "rb") as f:
+                uploaded = await client.post("/api/upload-resume", files={"file": ("resume.txt", f.read())})
+            resume_id = uploaded.json()["file_id"]
+            job_description_ids = []
+            for job_description in corpus["job_descriptions"]:
+                response = await client.post("/api/upload-job-description", json=job_description)
+                job_description_ids.append(response.json()["id"])
+
+            async def tailor(i: int):
+                if not options["warm"]:
+                    # A new prompt version per call, so cached sections are never reused
+                    settings.tailoring_prompt_version = f"benchmark-{i}-{os.getpid()}"
+                response = await client.post("/api/tailor-resume", json={
+                    "resume_id": resume_id,
+                    "job_description_id": job_description_ids[i % len(job_description_ids)],
+                    "mode": options["mode"],
+                })
+                response.raise_for_status()
+
+            name = f"tailor_resume[{options['mode']},{'warm' if options['warm'] else 'cold'}]"
+            result = await measure_async(tailor, options["iterations"], concurrency=options["concurrency"])
+            result["stub_latency_ms"] = options["latency_ms"]
+            return {name: result}
+    finally:
+        await main.app.router.shutdown()
+
+
+BENCHMARKS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Results]] = {
+    "parse_document": bench_parse_document,
+    "extract_sections": bench_extract_sections,
+    "generate_pdf": bench_generate_pdf,
+    "tailor_resume": bench_tailor_resume,
+}
@@ -1,19 +1,29 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from dotenv import load_dotenv
 
-from app.api import resume, job_description, tailoring
+from app.api import resume, job_description, tailoring, matching, metrics, admin
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, SessionLocal
+from app.core.metrics import HTTP_REQUEST_SECONDS, instrument_engine, stats_collector
+from app.core.migrations import run_migrations
+from app.core.profiling import request_profiler
+from app.utils.document_parser import parse_pool
+from app.utils.pdf_generator import render_pool
+from app.services.pdf_store import pdf_store
+from app.services.job_queue import job_queue
+from app.services.openai_client import openai_manager
+from app.services.keyword_extractor import fit_keyword_extractor
+from app.services.llm_cache import llm_cache
+from app.services.prompt_budget import load_token_encoding
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Resume Optimizer API",
     description="AI-powered resume tailoring service",
@@ -29,6 +39,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Label by route template, not raw path, to keep label cardinality bounded;
+    # streaming responses are timed to their first byte
+    route = request.scope.get("route")
+    HTTP_REQUEST_SECONDS.labels(
+        method=request.method,
+        route=route.path if route is not None else "unmatched",
+        status=str(response.status_code)
+    ).observe(time.perf_counter() - start)
+    return response
+
+if settings.profiling_enabled:
+    # Debug only: when disabled the middleware isn't installed at all, so requests pay nothing
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        return await request_profiler.handle(request, call_next)
+
+# Prometheus instrumentation: statement timing and the existing stats dicts as gauges
+instrument_engine(engine)
+stats_collector.add("llm_cache", llm_cache.get_stats)
+stats_collector.add("parse_pool", parse_pool.get_stats)
+stats_collector.add("render_pool", render_pool.get_stats)
+
 # Mount static files for generated PDFs
 os.makedirs("static/pdfs", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -37,6 +73,36 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 app.include_router(resume.router, prefix="/api", tags=["resume"])
 app.include_router(job_description.router, prefix="/api", tags=["job-description"])
 app.include_router(tailoring.router, prefix="/api", tags=["tailoring"])
+app.include_router(matching.router, prefix="/api", tags=["matching"])
+app.include_router(admin.router, prefix="/api", tags=["admin"])
+app.include_router(metrics.router, tags=["metrics"])
+
+@app.on_event("startup")
+async def start_background_services():
+    if settings.run_migrations_on_startup:
+        # Alembic's env.py runs its own event loop, so it can't run on this one
+        await asyncio.to_thread(run_migrations)
+    openai_manager.start()
+    # Reads (or, if allowed, downloads) tiktoken's BPE file; counts stay approximate until it's loaded
+    await asyncio.to_thread(load_token_encoding, settings.tiktoken_allow_download)
+    # Spawn render workers now so fonts and CSS are loaded before the first request
+    render_pool.warm_up()
+    app.state.pdf_sweeper = asyncio.create_task(
+        pdf_store.run_sweeper(settings.pdf_sweep_interval_seconds)
+    )
+    await job_queue.start()
+    async with SessionLocal() as db:
+        # Compile the skill matcher and build IDF weights
+        await fit_keyword_extractor(db, settings.local_keyword_idf_corpus_size)
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    app.state.pdf_sweeper.cancel()
+    await job_queue.stop()
+    parse_pool.shutdown()
+    render_pool.shutdown()
+    await openai_manager.close()
+    await engine.dispose()
 
 @app.get("/")
 async def root():
@@ -0,0 +1,32 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+# Settings require an API key at import time; the tests never call OpenAI
+os.environ.setdefault("openai_api_key", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import Base  # noqa: E402
+
+
+@pytest.fixture
+def run_db():
+    """Run `async def body(sessions)` against a fresh in-memory database with every table created"""
+
+    def run(body):
+        async def main():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            try:
+                return await body(async_sessionmaker(engine, expire_on_commit=False))
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
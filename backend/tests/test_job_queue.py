@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.database import TailoringJob
+from app.services.job_queue import TailoringJobQueue
+
+
+@pytest.fixture
+def queue():
+    return TailoringJobQueue(
+        workers=2,
+        max_attempts=3,
+        backoff_seconds=1,
+        poll_seconds=0.1,
+        lease_seconds=60,
+        callback_timeout_seconds=1
+    )
+
+
+def add_job(db, job_id, **columns):
+    columns.setdefault("status", "queued")
+    columns.setdefault("next_run_at", datetime.utcnow() - timedelta(seconds=1))
+    db.add(TailoringJob(id=job_id, request="{}", max_attempts=3, **columns))
+
+
+def test_claim_leases_job_to_one_worker(queue, run_db):
+    async def body(sessions):
+        async with sessions() as db:
+            add_job(db, "a")
+            await db.commit()
+
+        async with sessions() as first, sessions() as second:
+            job = await queue._claim(first)
+            assert await queue._claim(second) is None
+            return job
+
+    job = run_db(body)
+    assert job.id == "a"
+    assert job.status == "running"
+    assert job.attempts == 1
+    lease = (job.lease_expires_at - datetime.utcnow()).total_seconds()
+    assert 55 < lease <= 60
+
+
+def test_expired_lease_is_taken_over(queue, run_db):
+    async def body(sessions):
+        async with sessions() as db:
+            add_job(db, "live", status="running", attempts=1,
+                    lease_expires_at=datetime.utcnow() + timedelta(seconds=30))
+            add_job(db, "abandoned", status="running", attempts=1,
+                    lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+            await db.commit()
+
+            return await queue._claim(db), await queue._claim(db)
+
+    job, nothing_left = run_db(body)
+    assert job.id == "abandoned"
+    assert job.attempts == 2
+    assert job.lease_expires_at > datetime.utcnow()
+    assert nothing_left is None
+
+
+def test_jobs_waiting_for_backoff_are_not_claimed(queue, run_db):
+    async def body(sessions):
+        async with sessions() as db:
+            add_job(db, "later", next_run_at=datetime.utcnow() + timedelta(seconds=30))
+            add_job(db, "done", status="succeeded")
+            await db.commit()
+            return await queue._claim(db)
+
+    assert run_db(body) is None
+
+
+def test_job_abandoned_too_often_fails_without_running(queue, run_db, monkeypatch):
+    async def must_not_run(*args, **kwargs):
+        raise AssertionError("abandoned job was executed again")
+
+    monkeypatch.setattr(queue, "_execute", must_not_run)
+
+    async def body(sessions):
+        async with sessions() as db:
+            add_job(db, "poison", status="running", attempts=3,
+                    lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+            await db.commit()
+            job = await queue._claim(db)
+            await queue._run(db, job)
+            await db.refresh(job)
+            return job
+
+    job = run_db(body)
+    assert job.attempts == 4
+    assert job.status == "failed"
+    assert job.lease_expires_at is None
+    assert job.error == "Job was abandoned by its worker too many times"
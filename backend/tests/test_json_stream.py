@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from app.utils.json_stream import IncrementalObjectParser
+
+DOCUMENT = {
+    "summary": "Said \"hi\" {not a brace} and \\ then left",
+    "experience": "Line one\nLine two é",
+    "skills": ["python", "aws"],
+    "estimated_pages": 1.0,
+}
+
+
+def feed_in_chunks(text, size):
+    parser = IncrementalObjectParser()
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return parser, members
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_chunks_split_anywhere(size):
+    text = json.dumps(DOCUMENT)
+    parser, members = feed_in_chunks(text, size)
+    assert dict(members) == DOCUMENT
+    assert [key for key, _ in members] == list(DOCUMENT)
+    assert parser.finished
+
+
+def test_split_inside_escape_sequence():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"summary": "a \\') == []
+    assert parser.feed('"quoted\\" b", "x": 1') == [("summary", 'a "quoted" b')]
+    assert parser.feed("}") == [("x", 1)]
+    assert parser.finished
+
+
+def test_number_waits_for_delimiter():
+    parser = IncrementalObjectParser()
+    assert parser.feed('{"estimated_pages": 1') == []
+    assert parser.feed(".5") == []
+    assert parser.feed("}") == [("estimated_pages", 1.5)]
+
+
+def test_skips_text_before_object():
+    parser = IncrementalObjectParser()
+    assert parser.feed("Here is the resume: ") == []
+    assert parser.feed('{"summary": "S"}') == [("summary", "S")]
+    assert parser.finished
+
+
+def test_unfinished_object_is_not_finished():
+    parser, members = feed_in_chunks('{"summary": "S", "experience": "cut o', 4)
+    assert members == [("summary", "S")]
+    assert not parser.finished
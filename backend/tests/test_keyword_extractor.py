@@ -0,0 +1,24 @@
+import pytest
+
+from app.services.keyword_extractor import LocalKeywordExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return LocalKeywordExtractor()
+
+
+@pytest.mark.parametrize("text", [
+    "Experience with Node.js required",
+    "experience with node.js required",
+    "Strong Node and React skills",
+    "Built services in NodeJS",
+])
+def test_node_js_matches(extractor, text):
+    assert "node.js" in extractor.match_skills(text)
+
+
+def test_ambiguous_words_only_match_in_exact_case(extractor):
+    assert "go" in extractor.match_skills("Backend services written in Go")
+    assert "go" not in extractor.match_skills("Ready to go the extra mile")
+    assert "node.js" not in extractor.match_skills("Each node in the cluster")
@@ -0,0 +1,86 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.config import settings
+from app.services import ai_service, llm_cache as llm_cache_module
+from app.services.llm_cache import LLMCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache_module, "time", clock)
+    return clock
+
+
+def test_round_trip_through_disk(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"))
+    cache.set("k", {"technical_skills": ["python"]})
+
+    reopened = LLMCache(str(tmp_path / "cache.db"))
+    assert reopened.get("k") == {"technical_skills": ["python"]}
+    assert reopened.get("k") == {"technical_skills": ["python"]}
+    assert reopened.get("missing") is None
+    stats = reopened.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "cache.db"), ttl_seconds=60)
+    cache.set("k", "v")
+
+    clock.now += 60
+    assert cache.get("k") == "v"
+
+    clock.now += 1
+    assert cache.get("k") is None
+    # Expired on disk too, not just in memory
+    assert LLMCache(str(tmp_path / "cache.db"), ttl_seconds=60).get("k") is None
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    # No memory tier, so every lookup goes to SQLite
+    cache = LLMCache(str(tmp_path / "cache.db"), memory_entries=0, max_entries=2)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1
+    clock.now += 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"), memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert list(cache._memory) == ["b", "c"]
+
+
+def test_corrupt_file_raises_and_keyword_extraction_treats_it_as_a_miss(tmp_path, monkeypatch):
+    path = tmp_path / "cache.db"
+    path.write_bytes(b"this is not a sqlite database" * 100)
+    cache = LLMCache(str(path))
+    with pytest.raises(sqlite3.DatabaseError):
+        asyncio.run(cache.get_async("k"))
+
+    monkeypatch.setattr(ai_service, "llm_cache", cache)
+    monkeypatch.setattr(settings, "local_keyword_first_pass", True)
+    monkeypatch.setattr(settings, "local_keyword_confidence_threshold", 0.0)
+    keywords = asyncio.run(ai_service.AIService().extract_keywords_from_jd("Python and AWS experience required"))
+    assert "python" in keywords["technical_skills"]
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.database import JobDescription
+from app.models.schemas import JobDescription as JobDescriptionSchema
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+
+CREATED_AT = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(CREATED_AT, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (CREATED_AT, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(CREATED_AT, 1)[:-3], "WzEsMiwzXQ"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_pages_break_created_at_ties_by_id(run_db):
+    async def body(sessions):
+        async with sessions() as db:
+            # Five rows share one timestamp, so only the id orders them
+            times = [CREATED_AT] * 5 + [CREATED_AT - timedelta(seconds=1), CREATED_AT + timedelta(seconds=1)]
+            db.add_all(
+                JobDescription(title=f"JD {i}", company="Acme", content="...", created_at=created_at)
+                for i, created_at in enumerate(times)
+            )
+            await db.commit()
+
+            pages, cursor = [], None
+            while True:
+                page = await paginate(db, JobDescription, JobDescriptionSchema, cursor, 2, "id,title")
+                pages.append(page["items"])
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    return pages
+
+    pages = run_db(body)
+    assert [len(items) for items in pages] == [2, 2, 2, 1]
+    ids = [item["id"] for items in pages for item in items]
+    assert ids == [7, 5, 4, 3, 2, 1, 6]
+    assert set(pages[0][0]) == {"id", "title"}
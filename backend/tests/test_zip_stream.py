@@ -0,0 +1,35 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from app.utils.zip_stream import CHUNK_SIZE, ZipStream
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_streamed_archive_opens_with_zipfile(tmp_path, compression):
+    large = os.urandom(CHUNK_SIZE * 3 + 17)
+    small = b"%PDF-1.7 small"
+    (tmp_path / "large.pdf").write_bytes(large)
+    (tmp_path / "small.pdf").write_bytes(small)
+
+    archive = ZipStream(compression=compression)
+    large_chunks = list(archive.add_file("large.pdf", str(tmp_path / "large.pdf")))
+    chunks = large_chunks + list(archive.add_file("small.pdf", str(tmp_path / "small.pdf")))
+    chunks.append(archive.add_bytes("errors.txt", b"none\n"))
+    chunks.append(archive.close())
+
+    # The large file is handed out as it is read, not in one piece at the end
+    assert len(large_chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as result:
+        assert result.testzip() is None
+        assert result.namelist() == ["large.pdf", "small.pdf", "errors.txt"]
+        assert result.read("large.pdf") == large
+        assert result.read("small.pdf") == small
+        assert result.read("errors.txt") == b"none\n"
+
+
+def test_empty_archive(tmp_path):
+    with zipfile.ZipFile(io.BytesIO(ZipStream().close())) as result:
+        assert result.namelist() == []